@@ -1,5 +1,6 @@
+from functools import total_ordering
 from math import atan2, pi, sqrt
-from typing import List
+from typing import List, Optional, Sequence
 from typing import Tuple
 
 
@@ -48,6 +49,9 @@ class Point2(object):
     def __eq__(self, p: 'Point2') -> bool:
         return self.x == p.x and self.y == p.y
 
+    def __hash__(self):
+        return hash(self.to_tuple())
+
     def __cmp__(self, other: 'Point2'):
 
         if self < other:
@@ -104,6 +108,18 @@ class Point3(Point2):
     def __repr__(self) -> str:
         return '({}, {}, {})'.format(self.x, self.y, self.z)
 
+    def __lt__(self, p: 'Point3') -> bool:
+        return self.to_tuple() < p.to_tuple()
+
+    def __gt__(self, p: 'Point3') -> bool:
+        return self.to_tuple() > p.to_tuple()
+
+    def __eq__(self, p: 'Point3') -> bool:
+        return self.x == p.x and self.y == p.y and self.z == p.z
+
+    def __hash__(self):
+        return hash(self.to_tuple())
+
     def __add__(self, p: 'Point3') -> 'Point3':
         return Point3(self.x + p.x, self.y + p.y, self.z + p.z)
 
@@ -126,6 +142,11 @@ class Point3(Point2):
         return sqrt((self.x - p.x) ** 2 + (self.y - p.y) ** 2 + (self.z - p.z) ** 2)
 
 
+# coordinates are integers in the simulation, packed formats store them as doubles
+def to_number(value: float) -> float:
+    return int(value) if value.is_integer() else value
+
+
 class Segment2(object):
 
     def __init__(self, start: Point2, end: Point2):
@@ -185,13 +206,11 @@ class Segment3(object):
 
     def get_point(self, t: float) -> Point3:
 
-        point = self.start + t * (self.end - self.start)
-
-        point.x = round(point.x)
-        point.y = round(point.y)
-        point.z = round(point.z)
+        start, end = self.start, self.end
 
-        return point
+        return Point3(round(start.x + t * (end.x - start.x)),
+                      round(start.y + t * (end.y - start.y)),
+                      round(start.z + t * (end.z - start.z)))
 
     def length(self) -> float:
         return self.start.distance_between(self.end)
@@ -295,6 +314,7 @@ class Polygon(object):
         return [vertices[0], *sorted_p[:index], *reversed(sorted_p[index:])]
 
 
+@total_ordering
 class Circle(object):
 
     def __init__(self, center: Point2, radius: float):
@@ -302,27 +322,26 @@ class Circle(object):
         self.radius = radius
 
     def __contains__(self, point: Point2) -> bool:
-        return point.distance_between(self.center) <= self.radius
+        dx, dy = point.x - self.center.x, point.y - self.center.y
+        return dx * dx + dy * dy <= self.radius * self.radius
+
+    def box_overlaps(self, c: 'Circle') -> bool:
+        r = self.radius + c.radius
+        return abs(self.center.x - c.center.x) <= r and abs(self.center.y - c.center.y) <= r
 
     def intersects(self, c: 'Circle') -> bool:
-        return self.center.distance_between(c.center) <= self.radius + c.radius
+        r = self.radius + c.radius
+        dx, dy = self.center.x - c.center.x, self.center.y - c.center.y
+        return dx * dx + dy * dy <= r * r
 
     def __lt__(self, other: 'Circle'):
-        return self.center < other.center or (self.center == other.center and self.radius <= other.radius)
+        return (self.center, self.radius) < (other.center, other.radius)
 
     def __eq__(self, other: 'Circle'):
         return self.center == other.center and self.radius == other.radius
 
-    def __cmp__(self, other):
-
-        if self == other:
-            return 0
-        elif self < other:
-            return -1
-        return 1
-
     def __hash__(self):
-        return self.center, self.radius
+        return hash((self.center, self.radius))
 
     # todo remove
     def __str__(self):
@@ -340,7 +359,59 @@ class Sphere(Circle):
         self.radius = radius
 
     def __contains__(self, point: Point3) -> bool:
-        return point.distance_between(self.center) <= self.radius
+        dx, dy, dz = point.x - self.center.x, point.y - self.center.y, point.z - self.center.z
+        return dx * dx + dy * dy + dz * dz <= self.radius * self.radius
+
+    def box_overlaps(self, s: 'Sphere') -> bool:
+        r = self.radius + s.radius
+        return abs(self.center.x - s.center.x) <= r and abs(self.center.y - s.center.y) <= r \
+            and abs(self.center.z - s.center.z) <= r
 
     def intersects(self, s: 'Sphere'):
-        return self.center.distance_between(s.center) <= self.radius + s.radius
+        r = self.radius + s.radius
+        dx, dy, dz = self.center.x - s.center.x, self.center.y - s.center.y, self.center.z - s.center.z
+        return dx * dx + dy * dy + dz * dz <= r * r
+
+
+# batched tests against column arrays of centers and radii, zs is None for circles
+
+def boxes_overlap(shape: Circle, xs: Sequence[float], ys: Sequence[float], zs: Optional[Sequence[float]],
+                  rs: Sequence[float], indices: Optional[Sequence[int]] = None) -> List[int]:
+
+    x, y, radius = shape.center.x, shape.center.y, shape.radius
+    indices = range(len(xs)) if indices is None else indices
+
+    if zs is None:
+        return [i for i in indices if abs(xs[i] - x) <= radius + rs[i] and abs(ys[i] - y) <= radius + rs[i]]
+
+    z = shape.center.z
+    return [i for i in indices
+            if abs(xs[i] - x) <= radius + rs[i] and abs(ys[i] - y) <= radius + rs[i] and abs(zs[i] - z) <= radius + rs[i]]
+
+
+def shapes_intersect(shape: Circle, xs: Sequence[float], ys: Sequence[float], zs: Optional[Sequence[float]],
+                     rs: Sequence[float], indices: Optional[Sequence[int]] = None) -> List[int]:
+
+    x, y, radius = shape.center.x, shape.center.y, shape.radius
+    indices = range(len(xs)) if indices is None else indices
+    result = []
+
+    for i in indices:
+
+        r = radius + rs[i]
+        dx, dy = xs[i] - x, ys[i] - y
+        d = dx * dx + dy * dy
+
+        if zs is not None:
+            dz = zs[i] - shape.center.z
+            d += dz * dz
+
+        if d <= r * r:
+            result.append(i)
+
+    return result
+
+
+def find_intersecting(shape: Circle, xs: Sequence[float], ys: Sequence[float], zs: Optional[Sequence[float]],
+                      rs: Sequence[float]) -> List[int]:
+    return shapes_intersect(shape, xs, ys, zs, rs, boxes_overlap(shape, xs, ys, zs, rs))
@@ -1,5 +1,8 @@
-from random import randint, randrange
-from typing import List, Optional
+import random
+from bisect import bisect_right
+from random import Random
+from sys import float_info
+from typing import List, Optional, Tuple
 
 from objects.geometric_objects import Segment3, Point3
 
@@ -15,6 +18,40 @@ class Plane(object):
         self.radius = radius
         Plane.__COUNTER += 1
 
+    @staticmethod
+    def get_counter() -> int:
+        return Plane.__COUNTER
+
+    @staticmethod
+    def set_counter(value: int) -> None:
+        Plane.__COUNTER = value
+
+
+def _leg_samples(coefficient: float) -> int:
+
+    # positions per leg of the original stepper, which accumulated t += coefficient while t <= 1.
+    # the accumulated t is within a few ulps per step of k * coefficient, so the sum is only
+    # replayed when k * coefficient is that close to 1
+    k = int(1 / coefficient)
+
+    if k * coefficient > 1:
+        k -= 1
+    elif (k + 1) * coefficient <= 1:
+        k += 1
+
+    tolerance = 2 * (k + 2) * float_info.epsilon
+
+    if 1 - k * coefficient > tolerance and (k + 1) * coefficient - 1 > tolerance:
+        return k + 1
+
+    samples, t = 0, 0
+
+    while t <= 1:
+        samples += 1
+        t += coefficient
+
+    return samples
+
 
 class Flight(object):
 
@@ -25,10 +62,64 @@ class Flight(object):
     }
 
     def __init__(self, paths: List[Segment3], velocity: float, radius: float, type: int):
+
+        if not velocity > 0:
+            raise ValueError('Flight velocity must be positive, got {}.'.format(velocity))
+
         self.plane = Plane(velocity, radius)
         self.paths = paths
         self.type = type
 
+        # number of positions already taken along the path
+        self.tick = 0
+
+        self.__build_trajectory()
+
+    def __build_trajectory(self) -> None:
+
+        # paths never change after creation, so per-leg geometry is computed once
+        self.leg_starts = []
+        self.leg_directions = []
+        self.leg_lengths = []
+        self.leg_coefficients = []
+        self.leg_ticks = []
+        self.cumulative_distances = [0.0]
+        self.cumulative_ticks = [0]
+
+        for path in self.paths:
+
+            start, end = path.start, path.end
+            length = path.length()
+            coefficient = self.plane.velocity / length if length > 0 else 1.0
+
+            last = _leg_samples(coefficient) - 1
+
+            self.leg_starts.append((start.x, start.y, start.z))
+            self.leg_directions.append((end.x - start.x, end.y - start.y, end.z - start.z))
+            self.leg_lengths.append(length)
+            self.leg_coefficients.append(coefficient)
+            self.leg_ticks.append(last + 1)
+            self.cumulative_distances.append(self.cumulative_distances[-1] + length)
+            self.cumulative_ticks.append(self.cumulative_ticks[-1] + last + 1)
+
+    @property
+    def total_ticks(self) -> int:
+        return self.cumulative_ticks[-1]
+
+    @property
+    def path_index(self) -> int:
+        return min(bisect_right(self.cumulative_ticks, self.tick) - 1, len(self.paths))
+
+    @property
+    def t(self) -> float:
+
+        index = self.path_index
+
+        if index >= len(self.paths):
+            return 0
+
+        return (self.tick - self.cumulative_ticks[index]) * self.leg_coefficients[index]
+
     def __eq__(self, other: 'Flight'):
         return self.plane.id == other.plane.id
 
@@ -61,50 +152,79 @@ class Flight(object):
         return flight
 
     @classmethod
-    def get_random_flight(cls, min_x, max_x, min_y, max_y, min_h, max_h, velocity, radius) -> 'Flight':
+    def get_random_waypoints(cls, min_x, max_x, min_y, max_y, min_h, max_h,
+                             rng: Optional[Random] = None) -> Tuple[Optional[Point3], Point3, Point3, Optional[Point3]]:
+
+        rng = rng if rng is not None else random
+        randint, randrange = rng.randint, rng.randrange
 
         flight_type = randint(0, 2)
         c_start = Point3(randint(min_x, max_x), randint(min_y, max_y), randint(min_h, max_h))
         c_end = Point3(randint(min_x, max_x), randint(min_y, max_y), c_start.z)
+        to_point, l_point = None, None
 
         if flight_type == 0:
-            return Flight.get_external_flight(c_start, c_end, velocity, radius)
+            return to_point, c_start, c_end, l_point
 
-        elif flight_type == 1:
-            c_segment = Segment3(c_start, c_end)
+        c_segment = Segment3(c_start, c_end)
+        choice = randint(0, 1) if flight_type == 2 else None
+
+        if choice != 1:
             to_point = c_segment.get_point(randrange(-2, 0))
+            to_point.z = 0
+
+        if choice != 0:
             l_point = c_segment.get_point(randrange(1, 2) + 0.1)
-            to_point.z, l_point.z = 0, 0
+            l_point.z = 0
+
+        return to_point, c_start, c_end, l_point
+
+    @classmethod
+    def from_waypoints(cls, to_point: Optional[Point3], c_start: Point3, c_end: Point3, l_point: Optional[Point3],
+                       velocity: float, radius: float) -> 'Flight':
+
+        if to_point is None and l_point is None:
+            return Flight.get_external_flight(c_start, c_end, velocity, radius)
+
+        if to_point is not None and l_point is not None:
             return Flight.get_internal_flight(to_point, c_start, c_end, l_point, velocity, radius)
 
-        else:
-            c_segment = Segment3(c_start, c_end)
-            choice = randint(0, 1)
+        return Flight.get_h_internal_flight(to_point=to_point, c_start=c_start, c_end=c_end,
+                                            l_point=l_point, velocity=velocity, radius=radius)
 
-            if choice == 0:
-                to_point = c_segment.get_point(randrange(-2, 0))
-                l_point = None
-                to_point.z = 0
-            else:
-                to_point = None
-                l_point = c_segment.get_point(randrange(1, 2) + 0.1)
-                l_point.z = 0
+    @classmethod
+    def get_random_flight(cls, min_x, max_x, min_y, max_y, min_h, max_h, velocity, radius,
+                          rng: Optional[Random] = None) -> 'Flight':
 
-            return Flight.get_h_internal_flight(to_point=to_point, c_start=c_start, c_end=c_end,
-                                                l_point=l_point, velocity=velocity, radius=radius)
+        waypoints = Flight.get_random_waypoints(min_x, max_x, min_y, max_y, min_h, max_h, rng)
+        return Flight.from_waypoints(*waypoints, velocity, radius)
 
-    def get_plane_position(self):
+    def position_at(self, tick: int) -> Optional[Point3]:
 
-        for path in self.paths:
+        if not 0 <= tick < self.cumulative_ticks[-1]:
+            return None
 
-            t: float = 0
-            coefficient = self.plane.velocity / path.length()
+        # k * coefficient can differ from the old accumulated t in the last bits, which only
+        # shows when it moves a coordinate across a rounding boundary
+        index = bisect_right(self.cumulative_ticks, tick) - 1
+        t = (tick - self.cumulative_ticks[index]) * self.leg_coefficients[index]
+        x, y, z = self.leg_starts[index]
+        dx, dy, dz = self.leg_directions[index]
 
-            while t <= 1:
-                current_position = path.get_point(t)
-                yield current_position
-                t += coefficient
+        return Point3(round(x + t * dx), round(y + t * dy), round(z + t * dz))
 
-            t %= 1
+    def get_plane_position(self):
+
+        for tick in range(self.total_ticks):
+            yield self.position_at(tick)
 
         return None
+
+    def next_position(self) -> Optional[Point3]:
+
+        current_position = self.position_at(self.tick)
+
+        if current_position is not None:
+            self.tick += 1
+
+        return current_position
@@ -0,0 +1,3 @@
+from simulation.init import main
+
+main()
@@ -0,0 +1,299 @@
+import heapq
+import json
+from array import array
+from math import floor, sqrt
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from objects.geometric_objects import Point3
+
+
+class Histogram(object):
+
+    def __init__(self, bounds: Sequence[Tuple[float, float]], bins: Sequence[int]):
+
+        if len(bounds) != len(bins) or any(b <= 0 for b in bins) or any(lo >= hi for lo, hi in bounds):
+            raise ValueError('Histogram needs one positive bin count and a non-empty range per axis.')
+
+        self.bounds = [tuple(b) for b in bounds]
+        self.bins = list(bins)
+
+        size = 1
+        for b in self.bins:
+            size *= b
+
+        self.counts = array('q', bytes(8 * size))
+
+    def index(self, coordinates: Sequence[float]) -> int:
+
+        # values outside the range are clamped into the edge bins
+        index = 0
+
+        for value, (lo, hi), bins in zip(coordinates, self.bounds, self.bins):
+            i = min(max(floor((value - lo) / (hi - lo) * bins), 0), bins - 1)
+            index = index * bins + i
+
+        return index
+
+    def add(self, coordinates: Sequence[float], weight: int = 1) -> None:
+        self.counts[self.index(coordinates)] += weight
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def merge(self, other: 'Histogram') -> None:
+
+        if self.bounds != other.bounds or self.bins != other.bins:
+            raise ValueError('Cannot merge histograms with different shapes.')
+
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+
+    def to_dict(self) -> Dict:
+        return {'bounds': self.bounds, 'bins': self.bins, 'counts': list(self.counts)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Histogram':
+        histogram = cls(data['bounds'], data['bins'])
+        histogram.counts = array('q', data['counts'])
+        return histogram
+
+
+class RunningStats(object):
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value: float) -> None:
+
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return sqrt(self.variance)
+
+    def merge(self, other: 'RunningStats') -> None:
+
+        if other.count == 0:
+            return
+
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.min, self.max = other.count, other.mean, other.m2, other.min, other.max
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'variance': self.variance,
+                'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RunningStats':
+        stats = cls()
+        stats.count, stats.mean, stats.m2, stats.min, stats.max = \
+            data['count'], data['mean'], data['m2'], data['min'], data['max']
+        return stats
+
+
+class TopK(object):
+
+    def __init__(self, k: int):
+        self.k = k
+        self.heap: List[Tuple[int, Tuple[str, int]]] = []
+
+    def add(self, count: int, key: Tuple[str, int]) -> None:
+
+        # the same run merged twice must not list its flights twice
+        if any(key == existing for _, existing in self.heap):
+            return
+
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, (count, key))
+        elif (count, key) > self.heap[0]:
+            heapq.heapreplace(self.heap, (count, key))
+
+    def merge(self, other: 'TopK') -> None:
+
+        for count, key in other.heap:
+            self.add(count, key)
+
+    def items(self) -> List[Tuple[Tuple[str, int], int]]:
+        return [(key, count) for count, key in sorted(self.heap, reverse=True)]
+
+    def to_dict(self) -> Dict:
+        return {'k': self.k, 'items': self.items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TopK':
+
+        top = cls(data['k'])
+
+        for key, count in data['items']:
+            top.add(count, tuple(key))
+
+        return top
+
+
+class ConflictAnalytics(object):
+
+    def __init__(self, bounds: Sequence[Tuple[float, float]], bins: Sequence[int] = (64, 64, 8), top_k: int = 10,
+                 max_duration: int = 600, max_flight_conflicts: int = 600, run: str = ''):
+
+        # plane ids restart in every run, so top flights are keyed by (run, plane id)
+        self.run = run
+
+        self.heatmap_2d = Histogram(bounds[:2], bins[:2])
+        self.heatmap_3d = Histogram(bounds, bins)
+
+        self.conflicts_per_tick = RunningStats()
+        self.durations = RunningStats()
+        self.duration_histogram = Histogram([(0, max_duration)], [min(max_duration, 60)])
+        self.flight_conflicts = RunningStats()
+        self.flight_conflict_histogram = Histogram([(0, max_flight_conflicts)], [min(max_flight_conflicts, 60)])
+        self.top_flights = TopK(top_k)
+
+        # per airborne flight: start tick of its ongoing conflict and conflicted ticks so far,
+        # bounded by the live fleet rather than by the run length
+        self.ongoing: Dict[int, int] = {}
+        self.live_counts: Dict[int, int] = {}
+        self.ticks = 0
+
+    def observe(self, tick: int, points: Sequence[Point3], ids: Sequence[int], intersections: Set[Tuple],
+                finished: Sequence[int]) -> None:
+
+        # flights are counted from their first tick inside the area until they finish, leaving
+        # and re-entering a non-convex area does not split them
+        self.ticks += 1
+        conflicted = set()
+
+        for point, plane_id in zip(points, ids):
+
+            self.live_counts.setdefault(plane_id, 0)
+
+            if point.to_tuple() not in intersections:
+                continue
+
+            conflicted.add(plane_id)
+            self.heatmap_2d.add((point.x, point.y))
+            self.heatmap_3d.add((point.x, point.y, point.z))
+
+        self.conflicts_per_tick.add(len(conflicted))
+
+        for plane_id in conflicted:
+            self.ongoing.setdefault(plane_id, tick)
+            self.live_counts[plane_id] += 1
+
+        for plane_id in [i for i in self.ongoing if i not in conflicted]:
+            self.end_conflict(plane_id, tick)
+
+        for plane_id in finished:
+            if plane_id in self.live_counts:
+                self.retire(plane_id)
+
+    def end_conflict(self, plane_id: int, tick: int) -> None:
+        duration = tick - self.ongoing.pop(plane_id)
+        self.durations.add(duration)
+        self.duration_histogram.add((duration,))
+
+    def retire(self, plane_id: int) -> None:
+        count = self.live_counts.pop(plane_id)
+        self.flight_conflicts.add(count)
+        self.flight_conflict_histogram.add((count,))
+        self.top_flights.add(count, (self.run, plane_id))
+
+    def finish(self, tick: int) -> None:
+
+        for plane_id in list(self.ongoing):
+            self.end_conflict(plane_id, tick)
+
+        for plane_id in list(self.live_counts):
+            self.retire(plane_id)
+
+    def merge(self, other: 'ConflictAnalytics') -> None:
+
+        if self.ongoing or self.live_counts or other.ongoing or other.live_counts:
+            raise ValueError('Finish both aggregators before merging them.')
+
+        self.heatmap_2d.merge(other.heatmap_2d)
+        self.heatmap_3d.merge(other.heatmap_3d)
+        self.conflicts_per_tick.merge(other.conflicts_per_tick)
+        self.durations.merge(other.durations)
+        self.duration_histogram.merge(other.duration_histogram)
+        self.flight_conflicts.merge(other.flight_conflicts)
+        self.flight_conflict_histogram.merge(other.flight_conflict_histogram)
+        self.top_flights.merge(other.top_flights)
+        self.ticks += other.ticks
+        self.run = self.run if self.run == other.run else ''
+
+    def to_dict(self) -> Dict:
+        return {
+            'run': self.run,
+            'ticks': self.ticks,
+            'heatmap_2d': self.heatmap_2d.to_dict(),
+            'heatmap_3d': self.heatmap_3d.to_dict(),
+            'conflicts_per_tick': self.conflicts_per_tick.to_dict(),
+            'durations': self.durations.to_dict(),
+            'duration_histogram': self.duration_histogram.to_dict(),
+            'flight_conflicts': self.flight_conflicts.to_dict(),
+            'flight_conflict_histogram': self.flight_conflict_histogram.to_dict(),
+            'top_flights': self.top_flights.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ConflictAnalytics':
+
+        analytics = cls([(0, 1), (0, 1), (0, 1)], top_k=data['top_flights']['k'], run=data['run'])
+        analytics.ticks = data['ticks']
+        analytics.heatmap_2d = Histogram.from_dict(data['heatmap_2d'])
+        analytics.heatmap_3d = Histogram.from_dict(data['heatmap_3d'])
+        analytics.conflicts_per_tick = RunningStats.from_dict(data['conflicts_per_tick'])
+        analytics.durations = RunningStats.from_dict(data['durations'])
+        analytics.duration_histogram = Histogram.from_dict(data['duration_histogram'])
+        analytics.flight_conflicts = RunningStats.from_dict(data['flight_conflicts'])
+        analytics.flight_conflict_histogram = Histogram.from_dict(data['flight_conflict_histogram'])
+        analytics.top_flights = TopK.from_dict(data['top_flights'])
+        return analytics
+
+    def export(self, path: str) -> None:
+
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> 'ConflictAnalytics':
+
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+def merge_exports(paths: List[str], output: Optional[str] = None) -> ConflictAnalytics:
+
+    analytics = ConflictAnalytics.load(paths[0])
+
+    for path in paths[1:]:
+        analytics.merge(ConflictAnalytics.load(path))
+
+    if output is not None:
+        analytics.export(output)
+
+    return analytics
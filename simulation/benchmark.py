@@ -0,0 +1,77 @@
+import argparse
+import random
+from time import perf_counter
+from typing import Callable, List, Optional
+
+from objects.geometric_objects import Point3, Sphere
+from simulation.engine import Simulation
+from simulation.line_sweep import get_intersections
+from simulation.parallel_sweep import ParallelSweep
+from simulation.settings import get_settings
+
+
+def get_spheres(simulation: Simulation, count: int, seed: int) -> List[Sphere]:
+
+    settings = simulation.settings
+    rng = random.Random(seed)
+
+    return [
+        Sphere(Point3(rng.randint(simulation.min_x, simulation.max_x),
+                      rng.randint(simulation.min_y, simulation.max_y),
+                      rng.randint(settings.min_height, settings.max_height)),
+               settings.plane_radius)
+        for _ in range(count)
+    ]
+
+
+def measure(function: Callable, spheres: List[Sphere], repeat: int) -> float:
+
+    best = float('inf')
+
+    for _ in range(repeat):
+        start = perf_counter()
+        function(spheres)
+        best = min(best, perf_counter() - start)
+
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+
+    parser = argparse.ArgumentParser(prog='simulation.benchmark')
+    parser.add_argument('--config', default=None, help='path to the constants json file')
+    parser.add_argument('--aircraft', type=int, nargs='+', default=[1000, 4000, 16000])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--threads', action='store_true', help='use a thread pool instead of processes')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--skip-baseline', action='store_true', help='do not time the AVL line sweep')
+    args = parser.parse_args(argv)
+
+    simulation = Simulation(get_settings(args.config))
+
+    print('{:>9} {:>8} {:>10} {:>8} {:>8}'.format('aircraft', 'workers', 'seconds', 'speedup', 'pairs'))
+
+    for count in args.aircraft:
+
+        spheres = get_spheres(simulation, count, args.seed)
+
+        if not args.skip_baseline:
+            seconds = measure(get_intersections, spheres, args.repeat)
+            print('{:>9} {:>8} {:>10.4f} {:>8} {:>8}'.format(count, 'avl', seconds, '', ''))
+
+        reference = None
+
+        for workers in args.workers:
+
+            with ParallelSweep(workers, use_threads=args.threads) as sweep:
+                # first call starts the pool
+                pairs = len(sweep.get_pairs(spheres))
+                seconds = measure(sweep.get_pairs, spheres, args.repeat)
+
+            reference = reference or seconds
+            print('{:>9} {:>8} {:>10.4f} {:>8.2f} {:>8}'.format(count, workers, seconds, reference / seconds, pairs))
+
+
+if __name__ == '__main__':
+    main()
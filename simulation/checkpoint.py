@@ -0,0 +1,190 @@
+import os
+import struct
+import zlib
+from typing import List, Optional, Tuple
+
+from objects.geometric_objects import Point3, Segment3, to_number
+from objects.simulation_objects import Flight, Plane
+from simulation.engine import Simulation
+from simulation.scenario import Scenario
+from simulation.settings import Settings
+
+MAGIC = b'PSCK'
+VERSION = 3
+
+HEADER = struct.Struct('<4sH')
+
+# tick count, next spawn tick, plane id counter, consumed scenario plans (-1 without scenario),
+# flight count, intersection count
+STATE = struct.Struct('<qqqqII')
+
+# random.Random state: version, 625 state words, has gauss_next, gauss_next
+RNG_STATE = struct.Struct('<I625IBd')
+
+# spawn periods, requested, accepted, attempts and shortfalls, they drive the spawn batch sizes
+SPAWN_STATS = struct.Struct('<qqqqq')
+
+# plane id, flight type, leg count, tick, velocity, radius
+FLIGHT = struct.Struct('<qBBqdd')
+LEG = struct.Struct('<6d')
+INTERSECTION = struct.Struct('<3q')
+
+
+class CheckpointWriter(object):
+
+    def __init__(self, simulation: Simulation, path: str, chunk_size: int = 1024):
+
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.chunk_size = chunk_size
+
+        # only references and scalars are captured here, encoding happens in write_chunk
+        self.flights: List[Tuple[Flight, int]] = [(f, f.tick) for f in simulation.flights]
+        self.intersections = list(simulation.intersections)
+        self.position = 0
+
+        scenario = simulation.scenario
+        version, words, gauss_next = simulation.rng.getstate()
+
+        state = STATE.pack(simulation.tick_count, simulation.next_spawn_tick, Plane.get_counter(),
+                           scenario.consumed if scenario is not None else -1,
+                           len(self.flights), len(self.intersections))
+        rng_state = RNG_STATE.pack(version, *words, gauss_next is not None,
+                                   gauss_next if gauss_next is not None else 0.0)
+
+        stats = simulation.spawner.stats
+        spawn_stats = SPAWN_STATS.pack(stats.periods, stats.requested, stats.accepted, stats.attempts, stats.shortfalls)
+
+        self.compressor = zlib.compressobj()
+        self.file = open(self.tmp_path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION))
+        self.file.write(self.compressor.compress(state + rng_state + spawn_stats))
+
+    def is_done(self) -> bool:
+        return self.file is None
+
+    def write_chunk(self) -> bool:
+
+        if self.file is None:
+            return True
+
+        chunk = bytearray()
+
+        for flight, tick in self.flights[self.position:self.position + self.chunk_size]:
+
+            chunk += FLIGHT.pack(flight.plane.id, flight.type, len(flight.paths), tick,
+                                 flight.plane.velocity, flight.plane.radius)
+
+            for path in flight.paths:
+                chunk += LEG.pack(*path.start.to_tuple(), *path.end.to_tuple())
+
+        self.file.write(self.compressor.compress(chunk))
+        self.position += self.chunk_size
+
+        if self.position < len(self.flights):
+            return False
+
+        intersections = b''.join(INTERSECTION.pack(*point) for point in self.intersections)
+        self.file.write(self.compressor.compress(intersections))
+        self.file.write(self.compressor.flush())
+        self.file.close()
+        self.file = None
+
+        os.replace(self.tmp_path, self.path)
+        return True
+
+    def write_all(self) -> None:
+
+        while not self.write_chunk():
+            pass
+
+
+def save(simulation: Simulation, path: str) -> None:
+    CheckpointWriter(simulation, path).write_all()
+
+
+def load(path: str, settings: Settings, scenario: Optional[Scenario] = None) -> Simulation:
+
+    with open(path, 'rb') as f:
+
+        header = f.read(HEADER.size)
+
+        if len(header) != HEADER.size:
+            raise ValueError('Truncated checkpoint header in {}.'.format(path))
+
+        magic, version = HEADER.unpack(header)
+
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Unsupported checkpoint file {}.'.format(path))
+
+        data = memoryview(zlib.decompress(f.read()))
+
+    tick_count, next_spawn_tick, counter, consumed, n_flights, n_intersections = STATE.unpack_from(data, 0)
+    offset = STATE.size
+
+    if (consumed >= 0) != (scenario is not None):
+        raise ValueError('Checkpoint {} scenario state does not match the given scenario.'.format(path))
+
+    rng_state = RNG_STATE.unpack_from(data, offset)
+    offset += RNG_STATE.size
+
+    spawn_stats = SPAWN_STATS.unpack_from(data, offset)
+    offset += SPAWN_STATS.size
+
+    simulation = Simulation(settings, scenario)
+    simulation.rng.setstate((rng_state[0], rng_state[1:626], rng_state[627] if rng_state[626] else None))
+    simulation.tick_count = tick_count
+    simulation.next_spawn_tick = next_spawn_tick
+
+    stats = simulation.spawner.stats
+    stats.periods, stats.requested, stats.accepted, stats.attempts, stats.shortfalls = spawn_stats
+
+    if scenario is not None:
+        scenario.skip(consumed - scenario.consumed)
+
+    for _ in range(n_flights):
+
+        plane_id, type, n_legs, tick, velocity, radius = FLIGHT.unpack_from(data, offset)
+        offset += FLIGHT.size
+
+        paths = []
+
+        for values in LEG.iter_unpack(data[offset:offset + n_legs * LEG.size]):
+            coordinates = [to_number(x) for x in values]
+            paths.append(Segment3(Point3(*coordinates[:3]), Point3(*coordinates[3:])))
+
+        offset += n_legs * LEG.size
+
+        flight = Flight(paths, to_number(velocity), to_number(radius), type)
+        flight.plane.id = plane_id
+        flight.tick = tick
+        simulation.flights.append(flight)
+
+    simulation.intersections = set(
+        INTERSECTION.iter_unpack(data[offset:offset + n_intersections * INTERSECTION.size])
+    )
+
+    Plane.set_counter(counter)
+    return simulation
+
+
+def run_with_checkpoints(simulation: Simulation, ticks: int, path: str, every: int, chunk_size: int = 1024) -> None:
+
+    if every < 1:
+        raise ValueError('Checkpoint interval must be at least one tick.')
+
+    writer: Optional[CheckpointWriter] = None
+
+    for _ in range(ticks):
+
+        simulation.step()
+
+        # spread the encoding of a snapshot over the following ticks
+        if writer is not None and writer.write_chunk():
+            writer = None
+
+        if writer is None and simulation.tick_count % every == 0:
+            writer = CheckpointWriter(simulation, path, chunk_size)
+
+    if writer is not None:
+        writer.write_all()
@@ -0,0 +1,126 @@
+import random
+from typing import TYPE_CHECKING, List, Optional, Set, Tuple
+
+from objects.geometric_objects import Point2, Point3, Polygon, Sphere
+from objects.simulation_objects import Flight
+from simulation.line_sweep import get_intersections
+from simulation.scenario import Scenario
+from simulation.settings import Settings
+from simulation.spawn import SpawnService
+
+# only needed for annotations, the modules are imported where these optional features are enabled
+if TYPE_CHECKING:
+    from simulation.analytics import ConflictAnalytics
+    from simulation.parallel_sweep import ParallelSweep
+    from simulation.shared_buffer import PositionBuffer
+
+
+class Simulation(object):
+
+    def __init__(self, settings: Settings, scenario: Optional[Scenario] = None, seed: Optional[int] = None):
+
+        self.settings = settings
+        self.scenario = scenario
+        self.rng = random.Random(seed)
+        self.area = Polygon([Point2.from_tuple(point) for point in settings.flight_area])
+
+        self.min_x = min(self.area, key=lambda p: p.x).x
+        self.max_x = max(self.area, key=lambda p: p.x).x
+        self.min_y = min(self.area, key=lambda p: p.y).y
+        self.max_y = max(self.area, key=lambda p: p.y).y
+
+        self.flights: List[Flight] = []
+        self.points: List[Point3] = []
+        self.point_ids: List[int] = []
+        self.finished_ids: List[int] = []
+        self.intersections: Set[Tuple] = set()
+
+        self.tick_count = 0
+        self.next_spawn_tick = settings.spawn_period
+        self.spawner = SpawnService(self)
+
+        # observers in other processes can attach to this buffer by name
+        self.position_buffer: Optional['PositionBuffer'] = None
+        self.parallel_sweep: Optional['ParallelSweep'] = None
+        self.analytics: Optional['ConflictAnalytics'] = None
+
+    def step(self) -> None:
+
+        self.points = self.advance_flights()
+        self.intersections = self.detect_conflicts()
+
+        if self.position_buffer is not None:
+            self.publish_positions()
+
+        if self.analytics is not None:
+            self.analytics.observe(self.tick_count, self.points, self.point_ids, self.intersections,
+                                   self.finished_ids)
+
+        if self.scenario is not None:
+            self.spawn_scenario_flights()
+
+        elif self.spawn_due():
+            self.spawn_flights()
+            self.next_spawn_tick = self.tick_count + self.settings.spawn_period
+
+        self.tick_count += 1
+
+    def run(self, ticks: int) -> None:
+
+        for _ in range(ticks):
+            self.step()
+
+    def advance_flights(self) -> List[Point3]:
+
+        points = []
+        self.point_ids = []
+        self.finished_ids = []
+        active = []
+
+        for flight in self.flights:
+
+            point = flight.next_position()
+
+            if point is None:
+                self.finished_ids.append(flight.plane.id)
+                continue
+
+            active.append(flight)
+
+            if Point2.from_point3(point) in self.area:
+                points.append(point)
+                self.point_ids.append(flight.plane.id)
+
+        self.flights = active
+        return points
+
+    def publish_positions(self) -> None:
+
+        # observers are optional, so an overflowing frame is truncated and flagged rather than fatal
+        self.position_buffer.publish(self.tick_count, self.points,
+                                     [self.settings.plane_radius] * len(self.points), self.point_ids,
+                                     truncate=True)
+
+    def detect_conflicts(self) -> Set[Tuple]:
+
+        spheres = [Sphere(point, self.settings.plane_radius) for point in self.points]
+
+        if self.parallel_sweep is not None:
+            return self.parallel_sweep.get_intersections(spheres)
+
+        return get_intersections(spheres)
+
+    def spawn_due(self) -> bool:
+        return self.scenario is None and self.tick_count >= self.next_spawn_tick
+
+    def spawn_flights(self) -> None:
+
+        settings = self.settings
+        flights_to_generate = self.rng.randint(settings.min_fcount, settings.max_fcount)
+        self.flights.extend(self.spawner.spawn(flights_to_generate))
+
+    def spawn_scenario_flights(self) -> None:
+
+        for flight in self.scenario.pop_due(self.tick_count):
+            flight.next_position()
+            self.flights.append(flight)
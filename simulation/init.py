@@ -1,122 +1,123 @@
-import json
-import random
-from time import time
-from typing import Tuple
+import argparse
+from typing import List, Optional
 
-import pygame
+from simulation.engine import Simulation
+from simulation.scenario import Scenario
+from simulation.settings import get_settings
 
-from objects.geometric_objects import Point2, Polygon, Sphere
-from objects.simulation_objects import Flight
-from simulation.line_sweep import get_intersections
 
-with open('../resources/constants.json', 'r') as f:
-    CONSTANTS = json.load(f)
+def positive_int(value: str) -> int:
 
+    number = int(value)
 
-def get_color(key: str) -> Tuple:
-    return tuple(int(x) for x in CONSTANTS[key].split(','))
+    if number < 1:
+        raise argparse.ArgumentTypeError('expected a positive integer, got {}'.format(value))
 
+    return number
 
-pygame.init()
 
-clock = pygame.time.Clock()
-info = pygame.display.Info()
+def get_parser() -> argparse.ArgumentParser:
 
-BG_COLOR = get_color('color_white')
-WIDTH, HEIGHT = info.current_w, info.current_h
+    parser = argparse.ArgumentParser(prog='simulation')
+    parser.add_argument('--config', default=None, help='path to the constants json file')
+    parser.add_argument('--headless', action='store_true', help='run without opening a window')
+    parser.add_argument('--scenario', default=None, help='replay flight plans from a .csv or binary file')
+    parser.add_argument('--ticks', type=int, default=1000, help='number of ticks to run in headless mode')
+    parser.add_argument('--seed', type=int, default=None, help='seed for random traffic')
+    parser.add_argument('--checkpoint', default=None, help='periodically snapshot the simulation to this file')
+    parser.add_argument('--checkpoint-every', type=positive_int, default=1000, help='ticks between snapshots')
+    parser.add_argument('--resume', default=None, help='resume from a snapshot file')
+    parser.add_argument('--publish', type=positive_int, default=None, metavar='CAPACITY',
+                        help='publish positions each tick to a shared memory buffer of this capacity, '
+                             'larger frames are truncated')
+    parser.add_argument('--workers', type=positive_int, default=None,
+                        help='run conflict detection on a pool of this many processes')
+    parser.add_argument('--analytics', default=None,
+                        help='aggregate conflict statistics and export them as json to this file')
+    parser.add_argument('--tiles', type=int, nargs=2, default=None, metavar=('NX', 'NY'),
+                        help='split the flight area into NX x NY tiles, each run in its own process')
 
-screen = pygame.display.set_mode((WIDTH, HEIGHT),
-                                 pygame.HWSURFACE | pygame.DOUBLEBUF | pygame.RESIZABLE)
+    return parser
 
-pygame.display.set_caption(CONSTANTS['title'])
-screen.fill(BG_COLOR)
-pygame.display.flip()
 
-area = Polygon([Point2.from_tuple(point) for point in CONSTANTS['flight_area']])
+def main(argv: Optional[List[str]] = None) -> None:
 
-min_x = min(area, key=lambda p: p.x).x
-max_x = max(area, key=lambda p: p.x).x
-min_y = min(area, key=lambda p: p.y).y
-max_y = max(area, key=lambda p: p.y).y
+    parser = get_parser()
+    args = parser.parse_args(argv)
 
-# list of flight generators
-flights = []
+    if args.tiles and (not args.headless or args.checkpoint or args.resume or args.publish or args.workers
+                       or args.analytics):
+        parser.error('--tiles is only supported for headless runs without checkpoints, publishing, workers '
+                     'or analytics')
 
-running = True
-start = time()
+    settings = get_settings(args.config)
+    scenario = Scenario.from_file(args.scenario, settings.plane_radius) if args.scenario else None
 
-while running:
+    if args.tiles:
+        from simulation.partition import PartitionedSimulation
 
-    screen.fill(BG_COLOR)
+        with PartitionedSimulation(settings, *args.tiles, scenario=scenario, seed=args.seed) as simulation:
+            simulation.run(args.ticks)
 
-    pygame.draw.polygon(
-        screen,
-        get_color('color_black'),
-        [x.to_tuple() for x in area.vertices],
-        2
-    )
+        return
 
-    points = []
+    if args.resume:
+        from simulation import checkpoint
+        simulation = checkpoint.load(args.resume, settings, scenario)
+    else:
+        simulation = Simulation(settings, scenario, args.seed)
 
-    for flight in flights:
+    if args.publish:
+        from simulation.shared_buffer import PositionBuffer
+        simulation.position_buffer = PositionBuffer(args.publish)
+        print('Publishing positions to shared memory block {}'.format(simulation.position_buffer.name), flush=True)
 
-        try:
-            point = next(flight)
+    if args.workers:
+        from simulation.parallel_sweep import ParallelSweep
+        simulation.parallel_sweep = ParallelSweep(args.workers)
 
-            if Point2.from_point3(point) in area:
-                points.append(next(flight))
+    if args.analytics:
+        from simulation.analytics import ConflictAnalytics
+        simulation.analytics = ConflictAnalytics([(simulation.min_x, simulation.max_x),
+                                                  (simulation.min_y, simulation.max_y),
+                                                  (settings.min_height, settings.max_height)],
+                                                 run=args.analytics)
 
-        except StopIteration:
-            flights.remove(flight)
-            continue
+    try:
+        run(simulation, args)
 
-    intersections = get_intersections([Sphere(point, CONSTANTS['plane_radius']) for point in points])
+        if simulation.analytics is not None:
+            simulation.analytics.finish(simulation.tick_count)
+            simulation.analytics.export(args.analytics)
 
-    if time() - start >= CONSTANTS['fg_period']:
+    finally:
+        if simulation.parallel_sweep is not None:
+            simulation.parallel_sweep.close()
 
-        flights_to_generate = random.randint(CONSTANTS['min_fcount'], CONSTANTS['max_fcount'])
+        if simulation.position_buffer is not None:
+            simulation.position_buffer.close()
+            simulation.position_buffer.unlink()
 
-        # todo generate random flight types
-        for _ in range(flights_to_generate):
 
-            generated_flight = Flight.get_random_flight(
-                min_x, max_x,
-                min_y, max_y,
-                CONSTANTS['min_height'], CONSTANTS['max_height'],
-                random.randint(CONSTANTS['plane_min_velocity'], CONSTANTS['plane_max_velocity']),
-                CONSTANTS['plane_radius']
-            )
+def run(simulation: Simulation, args: argparse.Namespace) -> None:
 
-            position = generated_flight.get_plane_position()
-            c_sphere = Sphere(next(position), CONSTANTS['plane_radius'])
-            valid_flight = True
+    if args.headless:
 
-            for point in points:
-                if c_sphere.intersects(Sphere(point, CONSTANTS['plane_radius'])):
-                    valid_flight = False
-                    break
+        if args.checkpoint:
+            from simulation import checkpoint
+            checkpoint.run_with_checkpoints(simulation, args.ticks, args.checkpoint, args.checkpoint_every)
+        else:
+            simulation.run(args.ticks)
 
-            if valid_flight:
-                flights.append(position)
+        if simulation.scenario is None:
+            print(simulation.spawner.stats)
 
-        start = time()
+        return
 
-    for point in points:
+    # pygame is only needed for the visual mode
+    from simulation.renderer import Renderer
+    Renderer(simulation).run()
 
-        pygame.draw.circle(
-            screen,
-            get_color('color_black') if point.to_tuple() not in intersections else get_color('color_red'),
-            (point.x, point.y),
-            CONSTANTS['plane_radius'],
-            2
-        )
 
-    for event in pygame.event.get():
-
-        if event.type == pygame.QUIT:
-            running = not running
-
-    pygame.display.update()
-    clock.tick(10)
-
-pygame.quit()
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,20 @@
 from typing import List
 
-from bintrees import AVLTree as AVL
-
 from objects.geometric_objects import Sphere
 
 
 def get_intersections(spheres: List[Sphere]):
 
+    # deferred so importing this module stays cheap
+    from bintrees import AVLTree as AVL
+
     start_points_map = {}
     end_points_map = {}
 
+    # the index keeps spheres sharing a center or an event point apart
     for index, sphere in enumerate(spheres):
-        start_points_map[(sphere.center.x - sphere.radius, sphere.center.y)] = index
-        end_points_map[(sphere.center.x + sphere.radius, sphere.center.y)] = index
+        start_points_map[(sphere.center.x - sphere.radius, sphere.center.y, sphere.center.z, index)] = index
+        end_points_map[(sphere.center.x + sphere.radius, sphere.center.y, sphere.center.z, index)] = index
 
     event_points = [x for x in start_points_map.keys()]
     event_points.extend(x for x in end_points_map.keys())
@@ -26,50 +28,50 @@ def get_intersections(spheres: List[Sphere]):
 
     while len(start_points) > 0 and len(end_points) > 0:
 
-        if start_points[-1] <= end_points[-1]:
-            sphere = spheres[start_points_map[start_points[-1]]]
-            tree.insert(sphere.center, sphere)
+        # only x orders the events, at equal x a start must come first so touching spheres meet
+        if start_points[-1][0] <= end_points[-1][0]:
+            index = start_points_map[start_points[-1]]
+            sphere = spheres[index]
+            tree.insert((*sphere.center.to_tuple(), index), sphere)
 
             try:
-                key = sphere.center
+                key = (*sphere.center.to_tuple(), index)
 
                 while True:
-                    prev = tree.prev_item(key)[1]
+                    key, prev = tree.prev_item(key)
 
-                    if prev.intersects(sphere):
+                    if prev.box_overlaps(sphere) and prev.intersects(sphere):
                         # print('Intersection found: {} and {}'.format(prev, sphere))
                         s.add(prev.center.to_tuple())
                         s.add(sphere.center.to_tuple())
 
-                    key = prev.center
-
             except KeyError:
                 pass
 
             try:
-                key = sphere.center
+                key = (*sphere.center.to_tuple(), index)
 
                 while True:
-                    prev = tree.succ_item(key)[1]
+                    key, prev = tree.succ_item(key)
 
-                    if prev.intersects(sphere):
+                    if prev.box_overlaps(sphere) and prev.intersects(sphere):
                         # print('Intersection found: {} and {}'.format(prev, sphere))
                         s.add(prev.center.to_tuple())
                         s.add(sphere.center.to_tuple())
 
-                    key = prev.center
-
             except KeyError:
                 pass
 
             start_points.pop()
 
         else:
-            tree.remove(spheres[end_points_map[end_points[-1]]].center)
+            index = end_points_map[end_points[-1]]
+            tree.remove((*spheres[index].center.to_tuple(), index))
             end_points.pop()
 
     while len(end_points) > 0:
-        tree.remove(spheres[end_points_map[end_points[-1]]].center)
+        index = end_points_map[end_points[-1]]
+        tree.remove((*spheres[index].center.to_tuple(), index))
         end_points.pop()
 
     return s
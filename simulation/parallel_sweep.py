@@ -0,0 +1,178 @@
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from objects.geometric_objects import Sphere
+from simulation.shared_buffer import PositionBuffer
+
+
+def strip_pairs(xs: array, ys: array, zs: array, rs: array, owned: int, max_radius: float) -> List[Tuple[int, int]]:
+
+    # spheres are sorted by x, the first `owned` belong to this strip and the rest is overlap
+    pairs = []
+    n = len(xs)
+
+    for i in range(owned):
+
+        xi, yi, zi, ri = xs[i], ys[i], zs[i], rs[i]
+        reach = xi + ri + max_radius
+
+        for j in range(i + 1, n):
+
+            xj = xs[j]
+
+            if xj > reach:
+                break
+
+            r = ri + rs[j]
+            dy, dz = ys[j] - yi, zs[j] - zi
+
+            # most candidates in the x window are far apart in y or z
+            if abs(dy) > r or abs(dz) > r:
+                continue
+
+            dx = xj - xi
+
+            if dx * dx + dy * dy + dz * dz <= r * r:
+                pairs.append((i, j))
+
+    return pairs
+
+
+# shared position buffers attached by this worker process, by name
+_ATTACHED: Dict[str, PositionBuffer] = {}
+
+
+def _attach(name: str) -> PositionBuffer:
+
+    if name not in _ATTACHED:
+
+        # the master replaces its buffer when it grows, drop the old mapping
+        for old in _ATTACHED.values():
+            old.close()
+
+        _ATTACHED.clear()
+        _ATTACHED[name] = PositionBuffer.attach(name)
+
+    return _ATTACHED[name]
+
+
+def shared_strip_pairs(name: str, frame_id: int, lo: int, end: int, owned: int,
+                       max_radius: float) -> List[Tuple[int, int]]:
+
+    # process workers read the sorted columns in place instead of receiving pickled slices
+    with _attach(name).wait_for(frame_id, timeout=30.0) as frame:
+
+        views = [frame.xs[lo:end], frame.ys[lo:end], frame.zs[lo:end], frame.rs[lo:end]]
+
+        try:
+            return strip_pairs(*views, owned, max_radius)
+        finally:
+            for view in views:
+                view.release()
+
+
+class ParallelSweep(object):
+
+    def __init__(self, workers: int, strips_per_worker: int = 2, use_threads: bool = False):
+
+        if workers <= 0:
+            raise ValueError('Parallel sweep needs at least one worker.')
+
+        self.workers = workers
+        self.strips = workers * strips_per_worker
+
+        # the strip kernel is pure python and holds the GIL, so processes are the default,
+        # they read the sorted columns from a shared position buffer
+        self.use_threads = use_threads
+        self.executor: Executor = ThreadPoolExecutor(workers) if use_threads else ProcessPoolExecutor(workers)
+        self.buffer: Optional[PositionBuffer] = None
+        self.frames = 0
+
+    def share(self, spheres: List[Sphere], order: List[int]) -> PositionBuffer:
+
+        if self.buffer is None or self.buffer.capacity < len(order):
+
+            if self.buffer is not None:
+                self.buffer.close()
+                self.buffer.unlink()
+
+            self.buffer = PositionBuffer(max(2 * len(order), 1024))
+
+        self.buffer.publish(self.frames, [spheres[i].center for i in order], [spheres[i].radius for i in order],
+                            order)
+        return self.buffer
+
+    def get_pairs(self, spheres: List[Sphere]) -> Set[Tuple[int, int]]:
+
+        if len(spheres) < 2:
+            return set()
+
+        order = sorted(range(len(spheres)), key=lambda index: spheres[index].center.x)
+
+        xs = array('d', (spheres[i].center.x for i in order))
+        rs = array('d', (spheres[i].radius for i in order))
+
+        if self.use_threads:
+            ys = array('d', (spheres[i].center.y for i in order))
+            zs = array('d', (spheres[i].center.z for i in order))
+        else:
+            self.frames += 1
+            name = self.share(spheres, order).name
+
+        max_radius = max(rs)
+        overlap = 2 * max_radius
+        n = len(order)
+        strips = min(self.strips, n)
+        futures = []
+
+        for strip in range(strips):
+
+            lo = strip * n // strips
+            hi = (strip + 1) * n // strips
+            end = hi
+
+            while end < n and xs[end] - xs[hi - 1] <= overlap:
+                end += 1
+
+            if self.use_threads:
+                future = self.executor.submit(strip_pairs, xs[lo:end], ys[lo:end], zs[lo:end], rs[lo:end],
+                                              hi - lo, max_radius)
+            else:
+                future = self.executor.submit(shared_strip_pairs, name, self.frames, lo, end, hi - lo, max_radius)
+
+            futures.append((lo, future))
+
+        pairs = set()
+
+        for lo, future in futures:
+            for i, j in future.result():
+                a, b = order[lo + i], order[lo + j]
+                pairs.add((a, b) if a < b else (b, a))
+
+        return pairs
+
+    def get_intersections(self, spheres: List[Sphere]) -> Set[Tuple]:
+
+        s = set()
+
+        for a, b in self.get_pairs(spheres):
+            s.add(spheres[a].center.to_tuple())
+            s.add(spheres[b].center.to_tuple())
+
+        return s
+
+    def close(self) -> None:
+
+        self.executor.shutdown()
+
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer.unlink()
+            self.buffer = None
+
+    def __enter__(self) -> 'ParallelSweep':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,277 @@
+import multiprocessing as mp
+from math import ceil, floor, inf
+from typing import List, Optional, Set, Tuple
+
+from objects.geometric_objects import Point2, Point3, Sphere
+from objects.simulation_objects import Flight
+from simulation.engine import Simulation
+from simulation.line_sweep import get_intersections
+from simulation.scenario import Scenario
+from simulation.settings import Settings
+from simulation.shared_buffer import PositionBuffer
+
+
+class TileGrid(object):
+
+    def __init__(self, min_x: float, max_x: float, min_y: float, max_y: float, nx: int, ny: int, margin: float):
+
+        if nx <= 0 or ny <= 0:
+            raise ValueError('Tile grid must have at least one tile per axis.')
+
+        self.min_x = min_x
+        self.min_y = min_y
+        self.nx = nx
+        self.ny = ny
+        self.width = (max_x - min_x) / nx
+        self.height = (max_y - min_y) / ny
+        self.margin = margin
+
+    def __len__(self) -> int:
+        return self.nx * self.ny
+
+    def owner(self, x: float, y: float) -> int:
+
+        # points outside the bounding box belong to the nearest edge tile
+        i = min(max(floor((x - self.min_x) / self.width), 0), self.nx - 1)
+        j = min(max(floor((y - self.min_y) / self.height), 0), self.ny - 1)
+        return j * self.nx + i
+
+    def bounds(self, tile: int) -> Tuple[float, float, float, float]:
+
+        i, j = tile % self.nx, tile // self.nx
+
+        x0 = self.min_x + i * self.width if i > 0 else -inf
+        x1 = self.min_x + (i + 1) * self.width if i < self.nx - 1 else inf
+        y0 = self.min_y + j * self.height if j > 0 else -inf
+        y1 = self.min_y + (j + 1) * self.height if j < self.ny - 1 else inf
+
+        return x0, x1, y0, y1
+
+    def is_interior(self, tile: int, x: float, y: float) -> bool:
+
+        x0, x1, y0, y1 = self.bounds(tile)
+        m = self.margin
+        return x0 + m <= x < x1 - m and y0 + m <= y < y1 - m
+
+    def is_near(self, tile: int, x: float, y: float) -> bool:
+
+        x0, x1, y0, y1 = self.bounds(tile)
+        m = self.margin
+        return x0 - m <= x <= x1 + m and y0 - m <= y <= y1 + m
+
+    def neighbours(self, tile: int) -> List[int]:
+
+        # tiles narrower than the margin can hold conflicts more than one tile away
+        i, j = tile % self.nx, tile // self.nx
+        rx = max(ceil(self.margin / self.width), 1)
+        ry = max(ceil(self.margin / self.height), 1)
+        result = []
+
+        for nj in range(max(j - ry, 0), min(j + ry + 1, self.ny)):
+            for ni in range(max(i - rx, 0), min(i + rx + 1, self.nx)):
+                if (ni, nj) != (i, j):
+                    result.append(nj * self.nx + ni)
+
+        return result
+
+
+def _worker(tile: int, grid: TileGrid, settings: Settings, area, names: List[str], timeout: float,
+            connection) -> None:
+
+    buffers = [PositionBuffer.attach(name) for name in names]
+    neighbours = grid.neighbours(tile)
+    radius = settings.plane_radius
+    flights: List[Flight] = []
+
+    try:
+        while True:
+
+            message = connection.recv()
+
+            if message[0] == 'stop':
+                break
+
+            _, tick, incoming, gather = message
+            flights.extend(incoming)
+
+            active = []
+            positions = []
+            points = []
+            ids = []
+
+            for flight in flights:
+
+                point = flight.next_position()
+
+                if point is None:
+                    continue
+
+                active.append(flight)
+                positions.append(point)
+
+                if Point2.from_point3(point) in area:
+                    points.append(point)
+                    ids.append(flight.plane.id)
+
+            boundary = [i for i, p in enumerate(points) if not grid.is_interior(tile, p.x, p.y)]
+            error = None
+
+            try:
+                buffers[tile].publish(tick, [points[i] for i in boundary], [radius] * len(boundary),
+                                      [ids[i] for i in boundary])
+            except ValueError as e:
+                # neighbours still wait for this tick
+                buffers[tile].publish(tick, [], [], [])
+                error = str(e)
+
+            candidates = list(points)
+
+            try:
+                for neighbour in neighbours:
+                    with buffers[neighbour].wait_for(tick, timeout) as frame:
+                        candidates.extend(p for p in frame.points() if grid.is_near(tile, p.x, p.y))
+
+            except TimeoutError as e:
+                # a neighbour died or stalled, let the master fail instead of spinning here
+                error = 'tile {}: {}'.format(tile, e)
+
+            # the master discards the tick on any error
+            intersections = set() if error is not None else {
+                point for point in get_intersections([Sphere(p, radius) for p in candidates])
+                if grid.owner(point[0], point[1]) == tile
+            }
+
+            flights = []
+            emigrants = []
+
+            for flight, position in zip(active, positions):
+
+                if grid.owner(position.x, position.y) == tile:
+                    flights.append(flight)
+                else:
+                    emigrants.append((flight, position.x, position.y))
+
+            connection.send((intersections, emigrants, (points, ids) if gather else None, error))
+
+    finally:
+        for buffer in buffers:
+            buffer.close()
+
+        connection.close()
+
+
+class PartitionedSimulation(Simulation):
+
+    def __init__(self, settings: Settings, nx: int, ny: int, scenario: Optional[Scenario] = None,
+                 seed: Optional[int] = None, capacity: int = 4096, timeout: float = 30.0):
+
+        super().__init__(settings, scenario, seed)
+
+        self.grid = TileGrid(self.min_x, self.max_x, self.min_y, self.max_y, nx, ny, 2 * settings.plane_radius)
+        self.buffers = [PositionBuffer(capacity) for _ in range(len(self.grid))]
+        self.inboxes: List[List[Flight]] = [[] for _ in range(len(self.grid))]
+        self.pending_intersections: Set[Tuple] = set()
+
+        names = [buffer.shm.name for buffer in self.buffers]
+
+        self.connections = []
+        self.processes = []
+
+        for tile in range(len(self.grid)):
+
+            parent, child = mp.Pipe()
+            process = mp.Process(target=_worker,
+                                 args=(tile, self.grid, settings, self.area, names, timeout, child),
+                                 daemon=True)
+            process.start()
+            child.close()
+
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def route(self, flight: Flight, x: float, y: float) -> None:
+        self.inboxes[self.grid.owner(x, y)].append(flight)
+
+    def advance_flights(self) -> List[Point3]:
+
+        # between ticks self.flights only holds the flights spawned by the master
+        for flight in self.flights:
+            start = flight.paths[0].start
+            self.route(flight, start.x, start.y)
+
+        self.flights = []
+        gather = self.spawn_due()
+
+        for connection, inbox in zip(self.connections, self.inboxes):
+            connection.send(('tick', self.tick_count, inbox, gather))
+
+        self.inboxes = [[] for _ in range(len(self.grid))]
+        self.pending_intersections = set()
+        points = []
+        self.point_ids = []
+        errors = []
+
+        for connection in self.connections:
+
+            intersections, emigrants, tile_points, error = connection.recv()
+            self.pending_intersections |= intersections
+
+            for flight, x, y in emigrants:
+                self.route(flight, x, y)
+
+            if tile_points is not None:
+                points.extend(tile_points[0])
+                self.point_ids.extend(tile_points[1])
+
+            if error is not None:
+                errors.append(error)
+
+        if errors:
+            raise RuntimeError('; '.join(errors))
+
+        return points
+
+    def detect_conflicts(self) -> Set[Tuple]:
+        return self.pending_intersections
+
+    def close(self, timeout: float = 5.0) -> None:
+
+        try:
+            # workers that died already have a broken pipe
+            for connection in self.connections:
+
+                try:
+                    connection.send(('stop',))
+                except (BrokenPipeError, OSError):
+                    pass
+
+                try:
+                    connection.close()
+                except OSError:
+                    pass
+
+            for process in self.processes:
+
+                process.join(timeout)
+
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+        finally:
+            for buffer in self.buffers:
+
+                try:
+                    buffer.close()
+                finally:
+                    buffer.unlink()
+
+            self.connections = []
+            self.processes = []
+            self.buffers = []
+
+    def __enter__(self) -> 'PartitionedSimulation':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,71 @@
+import pygame
+
+from simulation.engine import Simulation
+
+
+class Renderer(object):
+
+    def __init__(self, simulation: Simulation):
+
+        self.simulation = simulation
+        self.settings = simulation.settings
+
+        pygame.init()
+
+        self.clock = pygame.time.Clock()
+        info = pygame.display.Info()
+
+        self.bg_color = self.settings.get_color('white')
+        self.width, self.height = info.current_w, info.current_h
+
+        self.screen = pygame.display.set_mode((self.width, self.height),
+                                              pygame.HWSURFACE | pygame.DOUBLEBUF | pygame.RESIZABLE)
+
+        pygame.display.set_caption(self.settings.title)
+        self.screen.fill(self.bg_color)
+        pygame.display.flip()
+
+    def draw(self) -> None:
+
+        simulation = self.simulation
+        black = self.settings.get_color('black')
+        red = self.settings.get_color('red')
+
+        self.screen.fill(self.bg_color)
+
+        pygame.draw.polygon(
+            self.screen,
+            black,
+            [x.to_tuple() for x in simulation.area.vertices],
+            2
+        )
+
+        for point in simulation.points:
+
+            pygame.draw.circle(
+                self.screen,
+                black if point.to_tuple() not in simulation.intersections else red,
+                (point.x, point.y),
+                self.settings.plane_radius,
+                2
+            )
+
+        pygame.display.update()
+
+    def run(self) -> None:
+
+        running = True
+
+        while running:
+
+            self.simulation.step()
+            self.draw()
+
+            for event in pygame.event.get():
+
+                if event.type == pygame.QUIT:
+                    running = not running
+
+            self.clock.tick(self.settings.fps)
+
+        pygame.quit()
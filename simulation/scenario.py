@@ -0,0 +1,260 @@
+import csv
+import struct
+from itertools import islice
+from math import isnan, nan
+from typing import Iterable, Iterator, List, Optional
+
+from objects.geometric_objects import Point3, to_number
+from objects.simulation_objects import Flight
+
+CSV_HEADER = ['spawn_tick', 'type',
+              'to_x', 'to_y', 'to_z',
+              'cs_x', 'cs_y', 'cs_z',
+              'ce_x', 'ce_y', 'ce_z',
+              'l_x', 'l_y', 'l_z',
+              'velocity']
+
+BINARY_MAGIC = b'PSCN'
+BINARY_VERSION = 1
+
+# spawn tick, flight type, takeoff / cruise start / cruise end / landing points, velocity
+RECORD = struct.Struct('<IB12dd')
+HEADER = struct.Struct('<4sH')
+
+
+class FlightPlan(object):
+
+    def __init__(self, spawn_tick: int, type: int, c_start: Point3, c_end: Point3, velocity: float,
+                 to_point: Optional[Point3] = None, l_point: Optional[Point3] = None):
+
+        self.spawn_tick = spawn_tick
+        self.type = type
+        self.c_start = c_start
+        self.c_end = c_end
+        self.velocity = velocity
+        self.to_point = to_point
+        self.l_point = l_point
+
+        self.validate()
+
+    def validate(self) -> None:
+
+        # reject malformed plans when they are read rather than when they spawn mid run
+        if self.type not in (0, 1, 2):
+            raise ValueError('Unknown flight type: {}'.format(self.type))
+
+        if self.spawn_tick < 0:
+            raise ValueError('Spawn tick must not be negative, got {}.'.format(self.spawn_tick))
+
+        if not self.velocity > 0:
+            raise ValueError('Velocity must be positive, got {}.'.format(self.velocity))
+
+        if self.c_start is None or self.c_end is None:
+            raise ValueError('Flight plan needs a cruise start and a cruise end point.')
+
+        ends = (self.to_point is not None) + (self.l_point is not None)
+        expected = {0: 0, 1: 2, 2: 1}[self.type]
+
+        if ends != expected:
+            raise ValueError('Flight of type {} needs {} of the takeoff and landing points, got {}.'
+                             .format(self.type, expected, ends))
+
+    @classmethod
+    def from_flight(cls, flight: Flight, spawn_tick: int) -> 'FlightPlan':
+
+        paths = flight.paths
+
+        if flight.type == 0:
+            return cls(spawn_tick, 0, paths[0].start, paths[0].end, flight.plane.velocity)
+
+        if flight.type == 1:
+            return cls(spawn_tick, 1, paths[1].start, paths[1].end, flight.plane.velocity,
+                       to_point=paths[0].start, l_point=paths[2].end)
+
+        # the cruise leg is the level one
+        if paths[0].start.z == paths[0].end.z:
+            return cls(spawn_tick, 2, paths[0].start, paths[0].end, flight.plane.velocity, l_point=paths[1].end)
+
+        return cls(spawn_tick, 2, paths[1].start, paths[1].end, flight.plane.velocity, to_point=paths[0].start)
+
+    def to_flight(self, radius: float) -> Flight:
+
+        if self.type == 0:
+            return Flight.get_external_flight(self.c_start, self.c_end, self.velocity, radius)
+
+        if self.type == 1:
+            return Flight.get_internal_flight(self.to_point, self.c_start, self.c_end, self.l_point,
+                                              self.velocity, radius)
+
+        return Flight.get_h_internal_flight(self.velocity, radius, self.c_start, self.c_end,
+                                            to_point=self.to_point, l_point=self.l_point)
+
+    def to_row(self) -> List:
+
+        def coordinates(point: Optional[Point3]) -> List:
+            return ['', '', ''] if point is None else list(point.to_tuple())
+
+        return [self.spawn_tick, self.type,
+                *coordinates(self.to_point), *coordinates(self.c_start),
+                *coordinates(self.c_end), *coordinates(self.l_point),
+                self.velocity]
+
+    @classmethod
+    def from_row(cls, row: List[str]) -> 'FlightPlan':
+
+        if len(row) != len(CSV_HEADER):
+            raise ValueError('Expected {} fields, got {}.'.format(len(CSV_HEADER), len(row)))
+
+        def point(fields: List[str]) -> Optional[Point3]:
+            return None if fields[0] == '' else Point3(*(_parse_number(x) for x in fields))
+
+        return cls(int(row[0]), int(row[1]), point(row[5:8]), point(row[8:11]), _parse_number(row[14]),
+                   to_point=point(row[2:5]), l_point=point(row[11:14]))
+
+    def pack(self) -> bytes:
+
+        def coordinates(point: Optional[Point3]) -> tuple:
+            return (nan, nan, nan) if point is None else point.to_tuple()
+
+        return RECORD.pack(self.spawn_tick, self.type,
+                           *coordinates(self.to_point), *coordinates(self.c_start),
+                           *coordinates(self.c_end), *coordinates(self.l_point),
+                           self.velocity)
+
+    @classmethod
+    def unpack(cls, values: tuple) -> 'FlightPlan':
+
+        def point(offset: int) -> Optional[Point3]:
+
+            if isnan(values[offset]):
+                return None
+
+            return Point3(*(to_number(x) for x in values[offset:offset + 3]))
+
+        return cls(values[0], values[1], point(5), point(8), to_number(values[14]),
+                   to_point=point(2), l_point=point(11))
+
+
+def _parse_number(value: str):
+    return int(value) if value.lstrip('-').isdigit() else float(value)
+
+
+def read_csv(path: str, chunk_size: int = 4096) -> Iterator[FlightPlan]:
+
+    with open(path, 'r', newline='') as f:
+
+        reader = csv.reader(f)
+        header = next(reader, None)
+
+        if header != CSV_HEADER:
+            raise ValueError('Unexpected scenario header in {}.'.format(path))
+
+        while True:
+            rows = list(islice(reader, chunk_size))
+
+            if not rows:
+                break
+
+            yield from (FlightPlan.from_row(row) for row in rows)
+
+
+def read_binary(path: str, chunk_size: int = 4096) -> Iterator[FlightPlan]:
+
+    with open(path, 'rb') as f:
+
+        header = f.read(HEADER.size)
+
+        if len(header) != HEADER.size:
+            raise ValueError('Truncated scenario header in {}.'.format(path))
+
+        magic, version = HEADER.unpack(header)
+
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError('Unsupported scenario file {}.'.format(path))
+
+        while True:
+            chunk = f.read(RECORD.size * chunk_size)
+
+            if not chunk:
+                break
+
+            if len(chunk) % RECORD.size != 0:
+                raise ValueError('Truncated scenario record in {}.'.format(path))
+
+            yield from (FlightPlan.unpack(values) for values in RECORD.iter_unpack(chunk))
+
+
+def read_scenario(path: str, chunk_size: int = 4096) -> Iterator[FlightPlan]:
+    return read_csv(path, chunk_size) if path.endswith('.csv') else read_binary(path, chunk_size)
+
+
+def write_csv(path: str, plans: Iterable[FlightPlan]) -> None:
+
+    with open(path, 'w', newline='') as f:
+
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        writer.writerows(plan.to_row() for plan in plans)
+
+
+def write_binary(path: str, plans: Iterable[FlightPlan]) -> None:
+
+    with open(path, 'wb') as f:
+
+        f.write(HEADER.pack(BINARY_MAGIC, BINARY_VERSION))
+
+        for plan in plans:
+            f.write(plan.pack())
+
+
+def write_scenario(path: str, plans: Iterable[FlightPlan]) -> None:
+
+    if path.endswith('.csv'):
+        write_csv(path, plans)
+    else:
+        write_binary(path, plans)
+
+
+class Scenario(object):
+
+    def __init__(self, plans: Iterable[FlightPlan], radius: float):
+
+        self.plans = iter(plans)
+        self.radius = radius
+        self.pending: Optional[FlightPlan] = next(self.plans, None)
+        self.last_tick = 0
+        self.consumed = 0
+
+    @classmethod
+    def from_file(cls, path: str, radius: float, chunk_size: int = 4096) -> 'Scenario':
+        return cls(read_scenario(path, chunk_size), radius)
+
+    def skip(self, count: int) -> None:
+
+        for _ in range(count):
+
+            if self.pending is None:
+                raise ValueError('Cannot skip past the end of the scenario.')
+
+            self.last_tick = self.pending.spawn_tick
+            self.pending = next(self.plans, None)
+            self.consumed += 1
+
+    def is_exhausted(self) -> bool:
+        return self.pending is None
+
+    def pop_due(self, tick: int) -> List[Flight]:
+
+        flights = []
+
+        while self.pending is not None and self.pending.spawn_tick <= tick:
+
+            if self.pending.spawn_tick < self.last_tick:
+                raise ValueError('Scenario is not sorted by spawn tick.')
+
+            self.last_tick = self.pending.spawn_tick
+            flights.append(self.pending.to_flight(self.radius))
+            self.pending = next(self.plans, None)
+            self.consumed += 1
+
+        return flights
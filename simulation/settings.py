@@ -0,0 +1,104 @@
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'resources', 'constants.json')
+
+
+class Settings(object):
+
+    def __init__(self, title: str, min_height: int, max_height: int, plane_radius: int,
+                 plane_min_velocity: int, plane_max_velocity: int, fg_period: float,
+                 min_fcount: int, max_fcount: int, fps: int,
+                 colors: Dict[str, Tuple[int, int, int]], flight_area: List[Tuple[int, int]]):
+
+        self.title = title
+        self.min_height = min_height
+        self.max_height = max_height
+        self.plane_radius = plane_radius
+        self.plane_min_velocity = plane_min_velocity
+        self.plane_max_velocity = plane_max_velocity
+        self.fg_period = fg_period
+        self.min_fcount = min_fcount
+        self.max_fcount = max_fcount
+        self.fps = fps
+        self.colors = colors
+        self.flight_area = flight_area
+
+        self.validate()
+
+    @classmethod
+    def from_dict(cls, constants: Dict) -> 'Settings':
+
+        try:
+            colors = {
+                key[len('color_'):]: Settings.parse_color(value)
+                for key, value in constants.items() if key.startswith('color_')
+            }
+
+            return cls(
+                title=str(constants['title']),
+                min_height=int(constants['min_height']),
+                max_height=int(constants['max_height']),
+                plane_radius=int(constants['plane_radius']),
+                plane_min_velocity=int(constants['plane_min_velocity']),
+                plane_max_velocity=int(constants['plane_max_velocity']),
+                fg_period=float(constants['fg_period']),
+                min_fcount=int(constants['min_fcount']),
+                max_fcount=int(constants['max_fcount']),
+                fps=int(constants.get('fps', 10)),
+                colors=colors,
+                flight_area=[(x, y) for x, y in constants['flight_area']]
+            )
+
+        except KeyError as e:
+            raise ValueError('Missing configuration key: {}'.format(e.args[0]))
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'Settings':
+
+        with open(path or DEFAULT_PATH, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+    @staticmethod
+    def parse_color(value: str) -> Tuple[int, int, int]:
+
+        color = tuple(int(x) for x in value.split(','))
+
+        if len(color) != 3 or any(not 0 <= c <= 255 for c in color):
+            raise ValueError('Invalid color: {}'.format(value))
+
+        return color
+
+    def validate(self) -> None:
+
+        if not 0 <= self.min_height <= self.max_height:
+            raise ValueError('Height bounds must satisfy 0 <= min_height <= max_height.')
+
+        if self.plane_radius <= 0:
+            raise ValueError('Plane radius must be positive.')
+
+        if not 0 < self.plane_min_velocity <= self.plane_max_velocity:
+            raise ValueError('Velocity bounds must satisfy 0 < plane_min_velocity <= plane_max_velocity.')
+
+        if self.fg_period <= 0 or self.fps <= 0:
+            raise ValueError('Flight generation period and fps must be positive.')
+
+        if not 0 <= self.min_fcount <= self.max_fcount:
+            raise ValueError('Flight count bounds must satisfy 0 <= min_fcount <= max_fcount.')
+
+        if len(self.flight_area) < 3:
+            raise ValueError('Flight area must have at least three vertices.')
+
+    @property
+    def spawn_period(self) -> int:
+        return max(1, round(self.fg_period * self.fps))
+
+    def get_color(self, key: str) -> Tuple[int, int, int]:
+        return self.colors[key]
+
+
+@lru_cache(maxsize=None)
+def get_settings(path: Optional[str] = None) -> Settings:
+    return Settings.load(path)
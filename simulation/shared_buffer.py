@@ -0,0 +1,185 @@
+from multiprocessing.shared_memory import SharedMemory
+from time import monotonic, sleep
+from typing import List, Optional, Sequence
+
+from objects.geometric_objects import Point3, to_number
+
+WORD_SIZE = 8
+
+# buffer header: magic, capacity, index of the last completed slot
+MAGIC = 0x50534842
+HEADER_WORDS = 3
+CURRENT = 2
+
+# slot header: sequence number (odd while being written), tick, stored aircraft count and
+# aircraft count before truncation
+SLOT_HEADER_WORDS = 4
+
+# x, y, z, radius and plane id per aircraft
+ARRAYS = 5
+
+
+class Frame(object):
+
+    def __init__(self, buffer: 'PositionBuffer', slot: int, seq: int, tick: int, count: int, total: int):
+
+        self.buffer = buffer
+        self.slot = slot
+        self.seq = seq
+        self.tick = tick
+        self.count = count
+        self.total = total
+
+        base = buffer.slot_base(slot) + SLOT_HEADER_WORDS
+        capacity = buffer.capacity
+
+        # zero-copy views into the slot
+        self.xs = buffer.doubles[base:base + count]
+        self.ys = buffer.doubles[base + capacity:base + capacity + count]
+        self.zs = buffer.doubles[base + 2 * capacity:base + 2 * capacity + count]
+        self.rs = buffer.doubles[base + 3 * capacity:base + 3 * capacity + count]
+        self.ids = buffer.words[base + 4 * capacity:base + 4 * capacity + count]
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > self.count
+
+    def is_consistent(self) -> bool:
+        return self.buffer.words[self.buffer.slot_base(self.slot)] == self.seq
+
+    def points(self) -> List[Point3]:
+        return [Point3(*(to_number(c) for c in xyz)) for xyz in zip(self.xs, self.ys, self.zs)]
+
+    def release(self) -> None:
+
+        for view in (self.xs, self.ys, self.zs, self.rs, self.ids):
+            view.release()
+
+    def __enter__(self) -> 'Frame':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.release()
+
+
+class PositionBuffer(object):
+
+    def __init__(self, capacity: int, name: Optional[str] = None):
+
+        create = name is None
+        size = (HEADER_WORDS + 2 * (SLOT_HEADER_WORDS + ARRAYS * capacity)) * WORD_SIZE
+
+        self.shm = SharedMemory(name=name, create=create, size=size if create else 0)
+        self.words = self.shm.buf.cast('q')
+        self.doubles = self.shm.buf.cast('d')
+
+        if create:
+            self.words[0] = MAGIC
+            self.words[1] = capacity
+            self.words[CURRENT] = 0
+
+        elif self.words[0] != MAGIC:
+            raise ValueError('Shared memory block {} is not a position buffer.'.format(name))
+
+        self.capacity = self.words[1]
+
+        # nothing has been published yet
+        if create:
+            for slot in range(2):
+                self.words[self.slot_base(slot) + 1] = -1
+
+    @classmethod
+    def attach(cls, name: str) -> 'PositionBuffer':
+        return cls(0, name)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def slot_base(self, slot: int) -> int:
+        return HEADER_WORDS + slot * (SLOT_HEADER_WORDS + ARRAYS * self.capacity)
+
+    def publish(self, tick: int, points: Sequence[Point3], radii: Sequence[float], ids: Sequence[int],
+                truncate: bool = False) -> None:
+
+        total = len(points)
+
+        if total > self.capacity and not truncate:
+            raise ValueError('{} aircraft exceed the buffer capacity of {}.'.format(total, self.capacity))
+
+        # a truncated frame keeps the first aircraft and records how many there were
+        count = min(total, self.capacity)
+        points, radii, ids = points[:count], radii[:count], ids[:count]
+
+        words, doubles = self.words, self.doubles
+        slot = 1 - words[CURRENT]
+        base = self.slot_base(slot)
+        data = base + SLOT_HEADER_WORDS
+        capacity = self.capacity
+
+        words[base] += 1
+
+        for index, point in enumerate(points):
+            doubles[data + index] = point.x
+            doubles[data + capacity + index] = point.y
+            doubles[data + 2 * capacity + index] = point.z
+
+        for index, radius in enumerate(radii):
+            doubles[data + 3 * capacity + index] = radius
+
+        for index, plane_id in enumerate(ids):
+            words[data + 4 * capacity + index] = plane_id
+
+        words[base + 1] = tick
+        words[base + 2] = count
+        words[base + 3] = total
+        words[base] += 1
+        words[CURRENT] = slot
+
+    def latest(self, retries: int = 100) -> Optional[Frame]:
+
+        words = self.words
+
+        for _ in range(retries):
+
+            slot = words[CURRENT]
+            base = self.slot_base(slot)
+            seq = words[base]
+
+            if seq % 2 == 1:
+                continue
+
+            tick, count, total = words[base + 1], words[base + 2], words[base + 3]
+
+            if words[base] == seq:
+                return Frame(self, slot, seq, tick, count, total) if tick >= 0 else None
+
+        return None
+
+    def wait_for(self, tick: int, timeout: Optional[float] = None) -> Frame:
+
+        deadline = None if timeout is None else monotonic() + timeout
+
+        while True:
+
+            frame = self.latest()
+
+            if frame is not None:
+
+                if frame.tick >= tick:
+                    return frame
+
+                frame.release()
+
+            if deadline is not None and monotonic() > deadline:
+                raise TimeoutError('Tick {} was not published in time.'.format(tick))
+
+            sleep(0)
+
+    def close(self) -> None:
+        self.words.release()
+        self.doubles.release()
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.shm.unlink()
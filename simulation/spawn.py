@@ -0,0 +1,148 @@
+from array import array
+from math import ceil, floor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from objects.geometric_objects import Point3, Sphere, find_intersecting
+from objects.simulation_objects import Flight
+
+if TYPE_CHECKING:
+    from simulation.engine import Simulation
+
+
+class OccupancyIndex(object):
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+
+        # per cell column arrays of centres and radii for the batched collision tiers
+        self.cells: Dict[Tuple[int, int], Tuple[array, array, array, array]] = {}
+
+    @classmethod
+    def from_points(cls, points: List[Point3], radius: float) -> 'OccupancyIndex':
+
+        index = cls(2 * radius)
+
+        for point in points:
+            index.add(Sphere(point, radius))
+
+        return index
+
+    def cell(self, point: Point3) -> Tuple[int, int]:
+        return floor(point.x / self.cell_size), floor(point.y / self.cell_size)
+
+    def add(self, sphere: Sphere) -> None:
+
+        key = self.cell(sphere.center)
+
+        if key not in self.cells:
+            self.cells[key] = array('d'), array('d'), array('d'), array('d')
+
+        xs, ys, zs, rs = self.cells[key]
+        xs.append(sphere.center.x)
+        ys.append(sphere.center.y)
+        zs.append(sphere.center.z)
+        rs.append(sphere.radius)
+
+    def is_free(self, sphere: Sphere) -> bool:
+
+        # cells are as wide as a radius sum, so only the neighbouring ones can hold a conflict
+        i, j = self.cell(sphere.center)
+
+        for di in (-1, 0, 1):
+            for dj in (-1, 0, 1):
+                columns = self.cells.get((i + di, j + dj))
+
+                if columns is not None and find_intersecting(sphere, *columns):
+                    return False
+
+        return True
+
+
+class SpawnStats(object):
+
+    def __init__(self):
+        self.periods = 0
+        self.requested = 0
+        self.accepted = 0
+        self.attempts = 0
+        self.shortfalls = 0
+
+    def record(self, requested: int, accepted: int, attempts: int) -> None:
+
+        self.periods += 1
+        self.requested += requested
+        self.accepted += accepted
+        self.attempts += attempts
+
+        if accepted < requested:
+            self.shortfalls += 1
+
+    @property
+    def acceptance_rate(self) -> float:
+        return self.accepted / self.attempts if self.attempts > 0 else 1.0
+
+    def __repr__(self) -> str:
+        return 'spawned {} of {} requested flights in {} periods, {} attempts, acceptance rate {:.2%}, ' \
+               '{} periods short'.format(self.accepted, self.requested, self.periods, self.attempts,
+                                         self.acceptance_rate, self.shortfalls)
+
+
+class SpawnService(object):
+
+    def __init__(self, simulation: 'Simulation', batch_size: int = 64, attempts_per_spawn: int = 20):
+        self.simulation = simulation
+        self.batch_size = batch_size
+        self.attempts_per_spawn = attempts_per_spawn
+        self.stats = SpawnStats()
+
+    def sample(self) -> Tuple[int, Tuple[Optional[Point3], Point3, Point3, Optional[Point3]]]:
+
+        simulation = self.simulation
+        settings = simulation.settings
+        velocity = simulation.rng.randint(settings.plane_min_velocity, settings.plane_max_velocity)
+
+        return velocity, Flight.get_random_waypoints(
+            simulation.min_x, simulation.max_x,
+            simulation.min_y, simulation.max_y,
+            settings.min_height, settings.max_height,
+            rng=simulation.rng
+        )
+
+    def spawn(self, target: int) -> List[Flight]:
+
+        radius = self.simulation.settings.plane_radius
+        index = OccupancyIndex.from_points(self.simulation.points, radius)
+        max_attempts = target * self.attempts_per_spawn
+
+        accepted = []
+        attempts = 0
+
+        while len(accepted) < target and attempts < max_attempts:
+
+            # size the batch from the acceptance rate seen so far, every drawn candidate is an attempt
+            seen = self.stats.attempts + attempts
+            rate = (self.stats.accepted + len(accepted)) / seen if seen > 0 else 1.0
+            missing = target - len(accepted)
+            batch_size = min(ceil(missing / max(rate, 0.05)), self.batch_size, max_attempts - attempts)
+
+            candidates = [self.sample() for _ in range(batch_size)]
+            attempts += batch_size
+
+            # only raw waypoints are drawn, a Flight (and its plane id) is built once a candidate is accepted
+            for velocity, waypoints in candidates:
+
+                to_point, c_start = waypoints[0], waypoints[1]
+                first = to_point if to_point is not None else c_start
+                sphere = Sphere(Point3(round(first.x), round(first.y), round(first.z)), radius)
+
+                if index.is_free(sphere):
+                    index.add(sphere)
+                    flight = Flight.from_waypoints(*waypoints, velocity, radius)
+                    flight.next_position()
+                    accepted.append(flight)
+
+                    if len(accepted) == target:
+                        break
+
+        self.stats.record(target, len(accepted), attempts)
+        return accepted
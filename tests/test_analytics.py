@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+from objects.geometric_objects import Point2, Point3
+from objects.simulation_objects import Flight
+from simulation.analytics import ConflictAnalytics, merge_exports
+from simulation.engine import Simulation
+from simulation.parallel_sweep import ParallelSweep
+from simulation.settings import DEFAULT_PATH, Settings
+
+
+def get_analytics(run: str = ''):
+    return ConflictAnalytics([(0, 300), (0, 300), (0, 200)], run=run)
+
+
+def get_finished_run(run: str):
+
+    analytics = get_analytics(run)
+    a, b = Point3(10, 10, 10), Point3(12, 10, 10)
+
+    for tick in range(3):
+        analytics.observe(tick, [a, b], [0, 1], {a.to_tuple(), b.to_tuple()}, [])
+
+    analytics.observe(3, [], [], set(), [0, 1])
+    return analytics
+
+
+def test_flight_leaving_and_reentering_is_counted_once():
+
+    analytics = get_analytics()
+    a, b = Point3(10, 10, 10), Point3(12, 10, 10)
+    conflict = {a.to_tuple(), b.to_tuple()}
+
+    analytics.observe(0, [a, b], [1, 2], conflict, [])
+    analytics.observe(1, [b], [2], set(), [])
+    analytics.observe(2, [a, b], [1, 2], conflict, [])
+    analytics.observe(3, [], [], set(), [1, 2])
+
+    assert not analytics.live_counts
+    assert analytics.flight_conflicts.count == 2
+    assert analytics.top_flights.items() == [(('', 2), 2), (('', 1), 2)]
+    assert analytics.durations.count == 4
+
+
+def test_flights_without_conflicts_are_included():
+
+    analytics = get_analytics()
+    a, b, c = Point3(10, 10, 10), Point3(12, 10, 10), Point3(200, 200, 10)
+
+    analytics.observe(0, [a, b, c], [1, 2, 3], {a.to_tuple(), b.to_tuple()}, [])
+    analytics.observe(1, [c], [3], set(), [1, 2])
+    analytics.observe(2, [], [], set(), [3])
+
+    assert analytics.flight_conflicts.count == 3
+    assert analytics.flight_conflicts.min == 0
+    assert analytics.flight_conflicts.mean == pytest.approx(2 / 3)
+    assert analytics.flight_conflict_histogram.total == 3
+
+
+def test_engine_retires_flights_when_they_finish():
+
+    with open(DEFAULT_PATH) as f:
+        constants = json.load(f)
+
+    # the area is notched from the left, flights along x = 50 leave it through the notch and come back
+    constants['flight_area'] = [(0, 0), (300, 0), (300, 300), (0, 300), (100, 150)]
+    simulation = Simulation(Settings.from_dict(constants), seed=1)
+    simulation.analytics = get_analytics()
+    simulation.next_spawn_tick = 10 ** 9
+
+    crossing = Flight.get_external_flight(Point3(50, 20, 100), Point3(50, 280, 100), 10, 30)
+    simulation.flights = [
+        crossing,
+        Flight.get_external_flight(Point3(50, 20, 110), Point3(50, 280, 110), 10, 30),
+        Flight.get_external_flight(Point3(250, 20, 100), Point3(250, 280, 100), 10, 30)
+    ]
+
+    inside = [Point2.from_point3(p) in simulation.area for p in crossing.get_plane_position()]
+    assert inside[0] and not all(inside) and inside[-1]
+
+    with ParallelSweep(1, use_threads=True) as sweep:
+        simulation.parallel_sweep = sweep
+        simulation.run(30)
+
+    analytics = simulation.analytics
+    assert not simulation.flights and not analytics.live_counts
+
+    assert analytics.flight_conflicts.count == 3
+    assert analytics.flight_conflicts.min == 0
+    assert analytics.flight_conflicts.max == sum(inside)
+    assert analytics.durations.count == 4
+
+
+def test_merged_top_flights_are_keyed_by_run(tmp_path):
+
+    paths = []
+
+    for run in ('first', 'second'):
+        path = str(tmp_path / '{}.json'.format(run))
+        get_finished_run(run).export(path)
+        paths.append(path)
+
+    merged = merge_exports(paths + paths[:1])
+    items = merged.top_flights.items()
+
+    assert sorted(key for key, _ in items) == [('first', 0), ('first', 1), ('second', 0), ('second', 1)]
+    assert all(count == 3 for _, count in items)
+    assert merged.flight_conflicts.count == 6
+
+
+def test_export_round_trip(tmp_path):
+
+    path = str(tmp_path / 'run.json')
+    analytics = get_finished_run('run')
+    analytics.export(path)
+
+    loaded = ConflictAnalytics.load(path)
+
+    assert json.dumps(loaded.to_dict()) == json.dumps(analytics.to_dict())
+    assert loaded.top_flights.items() == [(('run', 1), 3), (('run', 0), 3)]
@@ -0,0 +1,74 @@
+import pytest
+
+from objects.simulation_objects import Plane
+from simulation import checkpoint
+from simulation.engine import Simulation
+from simulation.parallel_sweep import ParallelSweep
+from simulation.settings import get_settings
+
+
+def get_state(simulation: Simulation):
+    return (simulation.tick_count, simulation.next_spawn_tick, Plane.get_counter(), repr(simulation.spawner.stats),
+            [(f.plane.id, f.tick) for f in simulation.flights], sorted(simulation.intersections),
+            simulation.rng.getstate())
+
+
+@pytest.fixture
+def sweep():
+    # the thread-backed strip sweep keeps these tests independent of bintrees
+    with ParallelSweep(1, use_threads=True) as sweep:
+        yield sweep
+
+
+def test_resume_matches_uninterrupted_run(tmp_path, sweep):
+
+    path = str(tmp_path / 'checkpoint.bin')
+
+    simulation = Simulation(get_settings(), seed=3)
+    simulation.parallel_sweep = sweep
+    simulation.run(150)
+    checkpoint.save(simulation, path)
+    saved = get_state(simulation)
+
+    simulation.run(100)
+    expected = get_state(simulation)
+
+    resumed = checkpoint.load(path, get_settings())
+    assert get_state(resumed) == saved
+
+    resumed.parallel_sweep = sweep
+    resumed.run(100)
+    assert get_state(resumed) == expected
+
+
+def test_incremental_writer_captures_state_at_creation(tmp_path, sweep):
+
+    path = str(tmp_path / 'checkpoint.bin')
+
+    simulation = Simulation(get_settings(), seed=5)
+    simulation.parallel_sweep = sweep
+    simulation.run(120)
+
+    writer = checkpoint.CheckpointWriter(simulation, path, chunk_size=3)
+    saved = get_state(simulation)
+
+    while not writer.write_chunk():
+        simulation.step()
+
+    assert get_state(checkpoint.load(path, get_settings())) == saved
+
+
+@pytest.mark.parametrize('content', [b'', b'PS', b'XXXX\x03\x00'])
+def test_malformed_checkpoint(tmp_path, content):
+
+    path = tmp_path / 'bad.bin'
+    path.write_bytes(content)
+
+    with pytest.raises(ValueError):
+        checkpoint.load(str(path), get_settings())
+
+
+def test_checkpoint_interval_must_be_positive(tmp_path):
+
+    with pytest.raises(ValueError):
+        checkpoint.run_with_checkpoints(Simulation(get_settings()), 10, str(tmp_path / 'c.bin'), 0)
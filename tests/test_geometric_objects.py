@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from objects.geometric_objects import Circle, Point2, Point3, Sphere, boxes_overlap, find_intersecting, \
+    shapes_intersect
+
+
+def get_shapes(dimensions: int, count: int, seed: int):
+
+    rng = random.Random(seed)
+
+    if dimensions == 2:
+        return [Circle(Point2(rng.randint(0, 100), rng.randint(0, 100)), rng.randint(1, 10)) for _ in range(count)]
+
+    return [Sphere(Point3(rng.randint(0, 100), rng.randint(0, 100), rng.randint(0, 30)), rng.randint(1, 10))
+            for _ in range(count)]
+
+
+def get_columns(shapes):
+
+    xs = [s.center.x for s in shapes]
+    ys = [s.center.y for s in shapes]
+    zs = [s.center.z for s in shapes] if isinstance(shapes[0], Sphere) else None
+    rs = [s.radius for s in shapes]
+
+    return xs, ys, zs, rs
+
+
+@pytest.mark.parametrize('dimensions', [2, 3])
+def test_batched_tiers_match_scalar(dimensions):
+
+    shapes = get_shapes(dimensions, 300, dimensions)
+    columns = get_columns(shapes)
+    subset = list(range(0, len(shapes), 3))
+
+    for probe in get_shapes(dimensions, 50, 10 + dimensions):
+
+        boxes = [i for i, s in enumerate(shapes) if probe.box_overlaps(s)]
+        hits = [i for i, s in enumerate(shapes) if probe.intersects(s)]
+
+        assert boxes_overlap(probe, *columns) == boxes
+        assert shapes_intersect(probe, *columns) == hits
+        assert find_intersecting(probe, *columns) == hits
+        assert set(hits) <= set(boxes)
+
+        assert boxes_overlap(probe, *columns, indices=subset) == [i for i in subset if i in boxes]
+        assert shapes_intersect(probe, *columns, indices=subset) == [i for i in subset if i in hits]
+
+
+def test_tangent_shapes_intersect():
+
+    assert Circle(Point2(0, 0), 3).intersects(Circle(Point2(5, 0), 2))
+    assert Sphere(Point3(0, 0, 0), 3).intersects(Sphere(Point3(0, 0, 5), 2))
+    assert not Sphere(Point3(0, 0, 0), 3).intersects(Sphere(Point3(0, 0, 6), 2))
+
+
+def test_circle_order_is_strict():
+
+    a, b = Circle(Point2(1, 2), 3), Circle(Point2(1, 2), 3)
+
+    assert a == b and hash(a) == hash(b)
+    assert not a < b and not b < a
+    assert a <= b and a >= b
+
+    small, large, right = Circle(Point2(1, 2), 1), Circle(Point2(1, 2), 4), Circle(Point2(2, 0), 1)
+    assert sorted([right, large, small]) == [small, large, right]
+    assert large > small and right > large
+
+
+def test_sphere_order_includes_z():
+
+    low, high = Sphere(Point3(1, 1, 0), 2), Sphere(Point3(1, 1, 5), 2)
+
+    assert low < high and not high < low
+    assert low != high
@@ -0,0 +1,35 @@
+import pytest
+
+from objects.geometric_objects import Point3, Sphere
+from simulation.parallel_sweep import ParallelSweep
+
+
+def line_sweep(spheres):
+
+    pytest.importorskip('bintrees')
+    from simulation.line_sweep import get_intersections
+
+    return get_intersections(spheres)
+
+
+@pytest.mark.parametrize('first, second', [((0, 0, 0), (60, 0, 0)), ((60, 0, 0), (0, 0, 0)),
+                                           ((0, 0, 0), (0, 60, 0)), ((0, 60, 0), (0, 0, 0)),
+                                           ((0, 0, 0), (0, 0, 60)), ((0, 0, 60), (0, 0, 0)),
+                                           ((0, 0, 0), (36, 48, 0)), ((36, 48, 0), (0, 0, 0))])
+def test_tangent_spheres_in_either_order(first, second):
+
+    spheres = [Sphere(Point3(*first), 30), Sphere(Point3(*second), 30)]
+    assert line_sweep(spheres) == {first, second}
+
+
+def test_lattice_matches_strip_sweep():
+
+    # neighbours on a lattice with spacing 2r touch exactly along x, y and z
+    spheres = [Sphere(Point3(x, y, z), 30) for x in range(0, 600, 60) for y in range(0, 300, 60)
+               for z in range(0, 180, 60) if (x + y + z) % 120 != 0]
+
+    with ParallelSweep(2, use_threads=True) as sweep:
+        expected = sweep.get_intersections(spheres)
+
+    assert line_sweep(spheres) == expected
+    assert line_sweep(list(reversed(spheres))) == expected
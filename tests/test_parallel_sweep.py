@@ -0,0 +1,86 @@
+import random
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from objects.geometric_objects import Point3, Sphere
+from simulation.engine import Simulation
+from simulation.init import get_parser
+from simulation.parallel_sweep import ParallelSweep
+from simulation.settings import get_settings
+
+
+def get_spheres(count: int, seed: int):
+    rng = random.Random(seed)
+    return [Sphere(Point3(rng.randint(0, 1500), rng.randint(0, 1000), rng.randint(5, 50)), 30) for _ in range(count)]
+
+
+def brute_force(spheres):
+    return {(i, j) for i in range(len(spheres)) for j in range(i + 1, len(spheres)) if spheres[i].intersects(spheres[j])}
+
+
+@pytest.mark.parametrize('count', [0, 1, 2, 40, 400])
+@pytest.mark.parametrize('workers, use_threads', [(1, True), (3, True), (2, False)])
+def test_pairs_match_brute_force(count, workers, use_threads):
+
+    spheres = get_spheres(count, count)
+
+    with ParallelSweep(workers, use_threads=use_threads) as sweep:
+        assert sweep.get_pairs(spheres) == brute_force(spheres)
+
+
+def test_process_workers_read_a_growing_shared_buffer():
+
+    with ParallelSweep(2) as sweep:
+
+        for count in (50, 1500, 40):
+            spheres = get_spheres(count, count)
+            assert sweep.get_pairs(spheres) == brute_force(spheres)
+
+        name = sweep.buffer.name
+        assert sweep.buffer.capacity >= 1500
+
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+def test_worker_count_must_be_positive():
+
+    with pytest.raises(SystemExit):
+        get_parser().parse_args(['--workers', '0'])
+
+
+def test_stacked_aircraft():
+
+    spheres = [Sphere(Point3(10, 10, 10), 30), Sphere(Point3(10, 10, 40), 30), Sphere(Point3(10, 10, 200), 30)]
+
+    with ParallelSweep(2, use_threads=True) as sweep:
+        assert sweep.get_pairs(spheres) == {(0, 1)}
+
+
+def test_matches_line_sweep():
+
+    pytest.importorskip('bintrees')
+    from simulation.line_sweep import get_intersections
+
+    spheres = get_spheres(800, 1)
+
+    with ParallelSweep(3, use_threads=True) as sweep:
+        assert sweep.get_intersections(spheres) == get_intersections(spheres)
+
+
+def test_seeded_run_matches_single_process():
+
+    pytest.importorskip('bintrees')
+    settings = get_settings()
+
+    reference = Simulation(settings, seed=11)
+    parallel = Simulation(settings, seed=11)
+
+    with ParallelSweep(2) as sweep:
+        parallel.parallel_sweep = sweep
+
+        for _ in range(300):
+            reference.step()
+            parallel.step()
+            assert parallel.intersections == reference.intersections
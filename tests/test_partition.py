@@ -0,0 +1,81 @@
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from simulation.engine import Simulation
+from simulation.partition import PartitionedSimulation, TileGrid
+from simulation.settings import get_settings
+
+
+def run(simulation: Simulation, ticks: int):
+
+    intersections = []
+
+    for _ in range(ticks):
+        simulation.step()
+        intersections.append(frozenset(simulation.intersections))
+
+    return intersections
+
+
+def test_owner_covers_points_outside_the_grid():
+
+    grid = TileGrid(0, 100, 0, 100, 2, 2, 10)
+
+    assert grid.owner(-50, -50) == 0
+    assert grid.owner(150, 150) == 3
+    assert grid.owner(49, 51) == 2
+    assert sorted(grid.neighbours(0)) == [1, 2, 3]
+
+
+def test_thin_tiles_reach_past_adjacent_tiles():
+
+    grid = TileGrid(0, 100, 0, 100, 1, 10, 25)
+
+    assert grid.neighbours(0) == [1, 2, 3]
+    assert grid.neighbours(5) == [2, 3, 4, 6, 7, 8]
+
+
+@pytest.mark.parametrize('nx, ny', [(1, 1), (2, 2), (3, 2), (1, 24), (30, 1)])
+def test_tiled_engine_matches_single_process(nx, ny):
+
+    pytest.importorskip('bintrees')
+    settings = get_settings()
+
+    expected = run(Simulation(settings, seed=7), 300)
+
+    with PartitionedSimulation(settings, nx, ny, seed=7) as simulation:
+        assert run(simulation, 300) == expected
+
+
+def test_close_survives_dead_worker():
+
+    simulation = PartitionedSimulation(get_settings(), 2, 2)
+    names = [buffer.name for buffer in simulation.buffers]
+    processes = list(simulation.processes)
+
+    processes[0].kill()
+    processes[0].join()
+    simulation.close()
+
+    assert not any(process.is_alive() for process in processes)
+
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+
+
+def test_stalled_neighbour_is_reported():
+
+    simulation = PartitionedSimulation(get_settings(), 2, 1, timeout=0.2)
+
+    try:
+        # only tile 0 gets the tick, so tile 1 never publishes it
+        connection = simulation.connections[0]
+        connection.send(('tick', 0, [], False))
+        _, _, _, error = connection.recv()
+
+        assert 'not published' in error
+
+    finally:
+        simulation.close()
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from objects.geometric_objects import Point3
+from objects.simulation_objects import Flight
+from simulation.scenario import CSV_HEADER, FlightPlan, Scenario, read_binary, read_csv, write_binary, write_csv
+
+
+def get_plans(count: int):
+    rng = random.Random(0)
+    return [FlightPlan.from_flight(Flight.get_random_flight(0, 1000, 0, 1000, 5, 200, rng.randint(1, 10), 30, rng=rng),
+                                   tick) for tick in range(count)]
+
+
+@pytest.mark.parametrize('write, read, name', [(write_csv, read_csv, 's.csv'), (write_binary, read_binary, 's.bin')])
+def test_round_trip(tmp_path, write, read, name):
+
+    plans = get_plans(50)
+    path = str(tmp_path / name)
+    write(path, plans)
+
+    assert [p.to_row() for p in read(path, chunk_size=7)] == [p.to_row() for p in plans]
+
+
+def test_plan_rebuilds_flight():
+
+    for plan in get_plans(30):
+        flight = plan.to_flight(30)
+        assert FlightPlan.from_flight(flight, plan.spawn_tick).to_row() == plan.to_row()
+
+
+@pytest.mark.parametrize('content', [b'', b'PSC', b'XXXX\x01\x00'])
+def test_malformed_binary_header(tmp_path, content):
+
+    path = tmp_path / 'bad.bin'
+    path.write_bytes(content)
+
+    with pytest.raises(ValueError):
+        list(read_binary(str(path)))
+
+
+@pytest.mark.parametrize('row', [
+    '0,1,,,,0,0,10,100,0,10,110,0,0,5',
+    '0,2,,,,0,0,10,100,0,10,,,,5',
+    '0,2,-10,0,0,0,0,10,100,0,10,110,0,0,5',
+    '0,0,-10,0,0,0,0,10,100,0,10,,,,5',
+    '0,0,,,,,,,100,0,10,,,,5',
+    '0,3,,,,0,0,10,100,0,10,,,,5',
+    '0,0,,,,0,0,10,100,0,10,,,,0',
+    '0,0,,,,0,0,10,100,0,10,,,,-2',
+    '-1,0,,,,0,0,10,100,0,10,,,,5',
+    '0,0,,,,0,0,10,100,0,10,,,',
+])
+def test_malformed_csv_row(tmp_path, row):
+
+    path = tmp_path / 's.csv'
+    path.write_text(','.join(CSV_HEADER) + '\n' + row + '\n')
+
+    with pytest.raises(ValueError):
+        list(read_csv(str(path)))
+
+
+def test_malformed_binary_record(tmp_path):
+
+    path = str(tmp_path / 's.bin')
+    plan = FlightPlan(0, 0, Point3(0, 0, 10), Point3(100, 0, 10), 5)
+    plan.velocity = 0
+    write_binary(path, [plan])
+
+    with pytest.raises(ValueError):
+        list(read_binary(path))
+
+
+def test_truncated_binary_record(tmp_path):
+
+    path = str(tmp_path / 's.bin')
+    write_binary(path, get_plans(3))
+
+    with open(path, 'ab') as f:
+        f.write(b'\x00' * 5)
+
+    with pytest.raises(ValueError):
+        list(read_binary(path))
+
+
+def test_scenario_rejects_unsorted_plans():
+
+    plans = [FlightPlan(tick, 0, Point3(0, 0, 10), Point3(100, 0, 10), 5) for tick in (5, 3)]
+    scenario = Scenario(plans, 30)
+
+    with pytest.raises(ValueError):
+        scenario.pop_due(10)
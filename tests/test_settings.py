@@ -0,0 +1,70 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from simulation.settings import DEFAULT_PATH, Settings
+
+
+@pytest.fixture
+def constants():
+    with open(DEFAULT_PATH) as f:
+        return json.load(f)
+
+
+def test_default_constants_load(constants):
+
+    settings = Settings.from_dict(constants)
+
+    assert settings.plane_radius == 30
+    assert settings.get_color('red') == (255, 0, 0)
+    assert settings.flight_area[0] == (1500, 1000)
+
+
+def test_missing_key(constants):
+
+    del constants['plane_radius']
+
+    with pytest.raises(ValueError, match='plane_radius'):
+        Settings.from_dict(constants)
+
+
+@pytest.mark.parametrize('key, value', [
+    ('color_red', '255,0'),
+    ('color_red', '256,0,0'),
+    ('min_height', -1),
+    ('max_height', 1),
+    ('plane_radius', 0),
+    ('plane_min_velocity', 0),
+    ('plane_max_velocity', 0),
+    ('fg_period', 0),
+    ('fps', 0),
+    ('min_fcount', -1),
+    ('max_fcount', 1),
+    ('flight_area', [[0, 0], [1, 1]]),
+    ('max_height', 'high')
+])
+def test_invalid_values(constants, key, value):
+
+    constants[key] = value
+
+    with pytest.raises(ValueError):
+        Settings.from_dict(constants)
+
+
+@pytest.mark.parametrize('fg_period, fps, expected', [(3, 10, 30), (0.25, 10, 2), (0.01, 10, 1), (1.5, 1, 2)])
+def test_spawn_period(constants, fg_period, fps, expected):
+
+    constants['fg_period'], constants['fps'] = fg_period, fps
+    assert Settings.from_dict(constants).spawn_period == expected
+
+
+def test_init_does_not_import_optional_dependencies():
+
+    code = 'import sys, simulation.init; print(sorted({"pygame", "bintrees"} & set(sys.modules)))'
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+
+    assert output.stdout.strip() == '[]'
@@ -0,0 +1,106 @@
+import pytest
+
+from objects.geometric_objects import Point3
+from simulation.engine import Simulation
+from simulation.init import get_parser
+from simulation.parallel_sweep import ParallelSweep
+from simulation.settings import get_settings
+from simulation.shared_buffer import PositionBuffer
+
+
+@pytest.fixture
+def buffer():
+
+    buffer = PositionBuffer(8)
+    yield buffer
+    buffer.close()
+    buffer.unlink()
+
+
+def test_nothing_published(buffer):
+    assert buffer.latest() is None
+
+
+def test_publish_and_attach(buffer):
+
+    points = [Point3(1, 2, 3), Point3(4, 5, 6)]
+    buffer.publish(7, points, [30, 30], [11, 12])
+
+    reader = PositionBuffer.attach(buffer.name)
+
+    with reader.wait_for(7, timeout=1) as frame:
+        assert (frame.tick, frame.count) == (7, 2)
+        assert [p.to_tuple() for p in frame.points()] == [p.to_tuple() for p in points]
+        assert list(frame.rs) == [30, 30] and list(frame.ids) == [11, 12]
+        assert frame.is_consistent()
+
+    reader.close()
+
+
+def test_double_buffering_detects_overwrite(buffer):
+
+    buffer.publish(0, [Point3(0, 0, 0)], [1], [0])
+    frame = buffer.latest()
+
+    buffer.publish(1, [], [], [])
+    assert frame.is_consistent()
+
+    # the second publish after the frame was taken reuses its slot
+    buffer.publish(2, [], [], [])
+    assert not frame.is_consistent()
+    frame.release()
+
+
+def test_capacity(buffer):
+
+    with pytest.raises(ValueError):
+        buffer.publish(0, [Point3(0, 0, 0)] * 9, [1] * 9, list(range(9)))
+
+
+def test_truncated_frame(buffer):
+
+    points = [Point3(i, i, i) for i in range(10)]
+    buffer.publish(0, points, [1] * 10, list(range(10)), truncate=True)
+
+    with buffer.latest() as frame:
+        assert (frame.count, frame.total) == (8, 10) and frame.truncated
+        assert list(frame.ids) == list(range(8))
+
+    buffer.publish(1, points[:3], [1] * 3, list(range(3)), truncate=True)
+
+    with buffer.latest() as frame:
+        assert (frame.count, frame.total) == (3, 3) and not frame.truncated
+
+
+def test_engine_survives_a_small_buffer():
+
+    simulation = Simulation(get_settings(), seed=1)
+    simulation.position_buffer = PositionBuffer(2)
+
+    try:
+        with ParallelSweep(1, use_threads=True) as sweep:
+            simulation.parallel_sweep = sweep
+            simulation.run(100)
+
+        with simulation.position_buffer.latest() as frame:
+            assert frame.tick == 99 and frame.count == 2
+            assert frame.total == len(simulation.points) > 2
+
+    finally:
+        simulation.position_buffer.close()
+        simulation.position_buffer.unlink()
+
+
+@pytest.mark.parametrize('value', ['0', '-1'])
+def test_publish_capacity_must_be_positive(value):
+
+    with pytest.raises(SystemExit):
+        get_parser().parse_args(['--publish', value])
+
+
+def test_wait_for_times_out(buffer):
+
+    buffer.publish(0, [], [], [])
+
+    with pytest.raises(TimeoutError):
+        buffer.wait_for(1, timeout=0.05)
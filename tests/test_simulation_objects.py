@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from objects.geometric_objects import Point3
+from objects.simulation_objects import Flight, Plane, _leg_samples
+
+
+def get_flights(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [Flight.get_random_flight(0, 1500, 0, 1000, 5, 200, rng.randint(1, 10), 30, rng=rng) for _ in range(count)]
+
+
+def accumulated_positions(flight: Flight):
+
+    # the stepper flights used before trajectory tables were introduced
+    positions = []
+
+    for path in flight.paths:
+
+        t = 0
+        coefficient = flight.plane.velocity / path.length()
+
+        while t <= 1:
+            positions.append(path.get_point(t).to_tuple())
+            t += coefficient
+
+    return positions
+
+
+def test_trajectory_matches_accumulating_stepper():
+
+    for flight in get_flights(2000):
+        assert [p.to_tuple() for p in flight.get_plane_position()] == accumulated_positions(flight)
+
+
+def test_position_at_matches_stepping():
+
+    for flight in get_flights(50, seed=2):
+
+        expected = [flight.position_at(tick).to_tuple() for tick in range(flight.total_ticks)]
+        stepped = []
+
+        while True:
+            point = flight.next_position()
+
+            if point is None:
+                break
+
+            stepped.append(point.to_tuple())
+
+        assert stepped == expected
+        assert flight.position_at(flight.total_ticks) is None
+        assert flight.path_index == len(flight.paths)
+
+
+def test_cursor_properties():
+
+    flight = Flight.get_internal_flight(Point3(0, 0, 0), Point3(0, 0, 10), Point3(100, 0, 10), Point3(110, 0, 0), 5, 30)
+
+    flight.tick = flight.cumulative_ticks[1]
+    assert (flight.path_index, flight.t) == (1, 0)
+
+    flight.tick += 2
+    assert flight.path_index == 1
+    assert abs(flight.t - 2 * 5 / 100) < 1e-12
+
+
+def test_leg_samples_match_accumulation():
+
+    rng = random.Random(3)
+    coefficients = [v / length for length in range(1, 500) for v in range(1, 11)]
+    coefficients += [rng.uniform(1e-4, 2) for _ in range(5000)]
+
+    for coefficient in coefficients:
+
+        samples, t = 0, 0
+
+        while t <= 1:
+            samples += 1
+            t += coefficient
+
+        assert _leg_samples(coefficient) == samples
+
+
+@pytest.mark.parametrize('velocity', [0, -3])
+def test_non_positive_velocity_is_rejected(velocity):
+
+    counter = Plane.get_counter()
+
+    with pytest.raises(ValueError):
+        Flight.get_external_flight(Point3(0, 0, 10), Point3(100, 0, 10), velocity, 30)
+
+    assert Plane.get_counter() == counter
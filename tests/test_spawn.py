@@ -0,0 +1,77 @@
+import pytest
+
+from objects.geometric_objects import Point3, Sphere
+from objects.simulation_objects import Plane
+from simulation.engine import Simulation
+from simulation.settings import get_settings
+from simulation.spawn import OccupancyIndex
+
+
+def test_every_draw_counts_as_attempt():
+
+    simulation = Simulation(get_settings(), seed=4)
+    spawner = simulation.spawner
+    draws = []
+    sample = spawner.sample
+
+    def counting_sample():
+        draws.append(None)
+        return sample()
+
+    spawner.sample = counting_sample
+
+    # a crowded sky forces rejections
+    simulation.points = [Point3(x, y, z) for x in range(0, 1500, 40) for y in range(0, 1000, 40)
+                         for z in range(0, 200, 40)]
+
+    counter = Plane.get_counter()
+    flights = spawner.spawn(5)
+
+    assert spawner.stats.attempts == len(draws)
+    assert spawner.stats.accepted == len(flights) < len(draws)
+
+    # only accepted candidates allocate plane ids
+    assert Plane.get_counter() - counter == len(flights)
+
+
+def test_batch_is_sized_from_acceptance_rate():
+
+    simulation = Simulation(get_settings(), seed=6)
+    spawner = simulation.spawner
+    spawner.stats.accepted, spawner.stats.attempts = 50, 100
+
+    counter = Plane.get_counter()
+    flights = spawner.spawn(10)
+
+    # half of the candidates were accepted so far, so twice the target is drawn in one batch
+    assert len(flights) == 10
+    assert spawner.stats.attempts == 120
+    assert Plane.get_counter() - counter == 10
+
+
+def test_spawned_flights_start_clear():
+
+    settings = get_settings()
+    simulation = Simulation(settings, seed=5)
+    simulation.points = [Point3(x, y, z) for x in range(0, 1500, 150) for y in range(0, 1000, 150)
+                         for z in range(0, 200, 50)]
+
+    flights = simulation.spawner.spawn(20)
+    spheres = [Sphere(p, settings.plane_radius) for p in simulation.points]
+    starts = [Sphere(f.position_at(0), settings.plane_radius) for f in flights]
+
+    assert flights and all(f.tick == 1 for f in flights)
+
+    for i, start in enumerate(starts):
+        assert not any(start.intersects(other) for other in spheres + starts[:i])
+
+
+@pytest.mark.parametrize('radius', [5, 30])
+def test_occupancy_index_matches_brute_force(radius):
+
+    points = [Point3(x * 7 % 311, x * 13 % 197, x * 3 % 41) for x in range(200)]
+    index = OccupancyIndex.from_points(points, radius)
+
+    for probe in [Point3(x * 11 % 311, x * 5 % 197, x % 41) for x in range(200)]:
+        sphere = Sphere(probe, radius)
+        assert index.is_free(sphere) == (not any(sphere.intersects(Sphere(p, radius)) for p in points))